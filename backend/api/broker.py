@@ -6,6 +6,7 @@ from backend.broker.upstox.client import UpstoxBroker
 from backend.config import settings
 from backend.services.market_calendar import is_market_open, get_market_calendar
 from backend.services.middleware_helper import get_middleware_instance
+from backend.services.broker_data_service import purge_disk_cache
 from datetime import datetime, timedelta
 import logging
 
@@ -306,6 +307,9 @@ def auth_callback(
             from dotenv import load_dotenv
             load_dotenv(override=True)
         
+        # New login - drop data persisted for the previous one
+        purge_disk_cache()
+        
         logger.info(f"Authentication successful for {broker_type}")
         
         return RedirectResponse(
@@ -429,6 +433,8 @@ def disconnect_broker(broker_type: str):
             from dotenv import load_dotenv
             load_dotenv(override=True)
         
+        purge_disk_cache()
+        
         return {"status": "success", "message": "Broker disconnected"}
     except HTTPException:
         raise
@@ -560,6 +566,9 @@ def update_env_config(broker_type: str, config_data: dict):
     from dotenv import load_dotenv
     load_dotenv(override=True)
     
+    # Credentials changed - persisted profile/instruments may belong to another account
+    purge_disk_cache()
+    
     return {
         "status": "success",
         "message": f"{broker_type.capitalize()} configuration updated in .env file"
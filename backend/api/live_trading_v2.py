@@ -541,23 +541,15 @@ async def get_live_trading_status() -> Dict:
         major_indicators = None
         minor_indicators = None
         
-        if len(_engine_instance.major_candles) > 0:
-            # Convert deque to list for trading logic service
-            major_candles_list = list(_engine_instance.major_candles)
-            if major_candles_list:
-                major_indicators = _engine_instance.trading_logic.get_latest_indicators(
-                    major_candles_list, 
-                    _engine_instance.config.major_trend_timeframe
-                )
+        if len(_engine_instance.major_close) > 0:
+            major_indicators = _engine_instance.trading_logic.calculate_indicators_from_array(
+                _engine_instance.major_close
+            )
         
-        if len(_engine_instance.minor_candles) > 0:
-            # Convert deque to list for trading logic service
-            minor_candles_list = list(_engine_instance.minor_candles)
-            if minor_candles_list:
-                minor_indicators = _engine_instance.trading_logic.get_latest_indicators(
-                    minor_candles_list, 
-                    _engine_instance.config.minor_trend_timeframe
-                )
+        if len(_engine_instance.minor_close) > 0:
+            minor_indicators = _engine_instance.trading_logic.calculate_indicators_from_array(
+                _engine_instance.minor_close
+            )
         
         status_data = {
             "running": _engine_instance.running,
@@ -1546,33 +1538,25 @@ async def get_market_data() -> Dict:
         if _engine_instance and _engine_instance.running:
             # Get indicators from running engine
             try:
-                if len(_engine_instance.major_candles) > 0:
-                    major_candles_list = list(_engine_instance.major_candles)
-                    if major_candles_list:
-                        major_ind = _engine_instance.trading_logic.get_latest_indicators(
-                            major_candles_list,
-                            _engine_instance.config.major_trend_timeframe
-                        )
-                        if major_ind:
-                            major_indicators = {
-                                "trend": major_ind.get('trend'),
-                                "ma7": major_ind.get('ma7'),
-                                "ma20": major_ind.get('ma20')
-                            }
+                if len(_engine_instance.major_close) > 0:
+                    major_ind = _engine_instance.trading_logic.calculate_indicators_from_array(
+                        _engine_instance.major_close
+                    )
+                    major_indicators = {
+                        "trend": major_ind.get('trend'),
+                        "ma7": major_ind.get('ma7'),
+                        "ma20": major_ind.get('ma20')
+                    }
                 
-                if len(_engine_instance.minor_candles) > 0:
-                    minor_candles_list = list(_engine_instance.minor_candles)
-                    if minor_candles_list:
-                        minor_ind = _engine_instance.trading_logic.get_latest_indicators(
-                            minor_candles_list,
-                            _engine_instance.config.minor_trend_timeframe
-                        )
-                        if minor_ind:
-                            minor_indicators = {
-                                "trend": minor_ind.get('trend'),
-                                "ma7": minor_ind.get('ma7'),
-                                "ma20": minor_ind.get('ma20')
-                            }
+                if len(_engine_instance.minor_close) > 0:
+                    minor_ind = _engine_instance.trading_logic.calculate_indicators_from_array(
+                        _engine_instance.minor_close
+                    )
+                    minor_indicators = {
+                        "trend": minor_ind.get('trend'),
+                        "ma7": minor_ind.get('ma7'),
+                        "ma20": minor_ind.get('ma20')
+                    }
             except Exception as e:
                 logger.warning(f"Could not fetch indicators from engine: {e}")
         
@@ -11,6 +11,8 @@ from backend.services.market_calendar import (
     get_market_status,
     is_trading_day as check_trading_day,
     get_current_ist_time,
+    is_trading_weekday,
+    WEEKDAY_NAMES,
     get_next_trading_day as get_next_trading_session
 )
 from backend.schemas import MarketStatusResponse
@@ -18,6 +20,16 @@ from backend.schemas import MarketStatusResponse
 router = APIRouter(prefix="/api/market-time", tags=["market-time"])
 
 
+def _parse_query_date(value: str) -> datetime:
+    """Parse a strict YYYY-MM-DD query parameter"""
+    if len(value) != 10 or value[4] != '-' or value[7] != '-':
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+
+
 @router.get("/status", response_model=MarketStatusResponse)
 async def get_status():
     """Get current market status"""
@@ -35,21 +47,18 @@ async def check_trading_day_endpoint(
     """Check if a date is a trading day"""
     try:
         if date:
-            try:
-                check_date = datetime.strptime(date, '%Y-%m-%d')
-            except ValueError:
-                raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+            check_date = _parse_query_date(date)
         else:
             check_date = get_current_ist_time()
         
         is_trading = check_trading_day(check_date)
-        is_weekend = check_date.weekday() >= 5
+        is_weekend = not is_trading_weekday(check_date.weekday())
         
         return {
             "date": check_date.strftime('%Y-%m-%d'),
             "is_trading_day": is_trading,
             "is_weekend": is_weekend,
-            "day_of_week": check_date.strftime('%A')
+            "day_of_week": WEEKDAY_NAMES[check_date.weekday()]
         }
     except HTTPException:
         raise
@@ -64,10 +73,7 @@ async def get_next_trading_day(
     """Get the next trading day after a given date"""
     try:
         if from_date:
-            try:
-                start_date = datetime.strptime(from_date, '%Y-%m-%d')
-            except ValueError:
-                raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+            start_date = _parse_query_date(from_date)
         else:
             start_date = get_current_ist_time()
         
@@ -79,7 +85,7 @@ async def get_next_trading_day(
         return {
             "from_date": start_date.strftime('%Y-%m-%d'),
             "next_trading_day": next_trading,
-            "day_of_week": datetime.strptime(next_trading, '%Y-%m-%d').strftime('%A')
+            "day_of_week": WEEKDAY_NAMES[datetime.fromisoformat(next_trading).weekday()]
         }
     except HTTPException:
         raise
@@ -6,7 +6,7 @@ REST API endpoints for monitoring the unified broker middleware status.
 """
 from fastapi import APIRouter, HTTPException
 
-from backend.schemas import MiddlewareStatus
+from backend.schemas import MiddlewareStatus, MiddlewareStatusFlags
 from backend.services.middleware_helper import get_middleware_instance
 
 router = APIRouter(prefix="/api/middleware", tags=["middleware"])
@@ -33,3 +33,19 @@ async def get_middleware_status():
         return MiddlewareStatus(**status)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting middleware status: {str(e)}")
+
+
+@router.get("/status/flags", response_model=MiddlewareStatusFlags)
+async def get_middleware_status_flags():
+    """
+    Get middleware status with booleans packed into a single bitfield
+    
+    Returns:
+        - status_flags: Bitwise OR of MiddlewareStatusFlags.FLAG_* values
+        - subscribed_instruments: Number of subscribed instruments
+    """
+    try:
+        middleware = get_middleware_instance()
+        return MiddlewareStatusFlags.from_status(middleware.get_status())
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting middleware status: {str(e)}")
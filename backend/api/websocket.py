@@ -2,7 +2,7 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from backend.services.middleware_helper import get_middleware_instance
 from typing import List
-import json
+import orjson
 import logging
 import asyncio
 
@@ -10,6 +10,11 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _dumps(message: dict) -> str:
+    """Serialize an outgoing message to a text frame"""
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 class ConnectionManager:
     """Manage WebSocket connections with per-API-key and per-connection limits.
 
@@ -45,7 +50,7 @@ class ConnectionManager:
         try:
             raw = await asyncio.wait_for(websocket.receive_text(), timeout=8)
         except asyncio.TimeoutError:
-            await websocket.send_text(json.dumps({
+            await websocket.send_text(_dumps({
                 "type": "error",
                 "message": "Registration required: send {\"type\": \"register\", \"api_key\": \"...\"} immediately after connecting"
             }))
@@ -53,7 +58,7 @@ class ConnectionManager:
             return False
 
         try:
-            msg = json.loads(raw)
+            msg = orjson.loads(raw)
             if msg.get("type") not in ("register", "auth"):
                 raise ValueError("invalid registration type")
 
@@ -61,14 +66,14 @@ class ConnectionManager:
             if not api_key:
                 raise ValueError("missing api_key")
         except Exception:
-            await websocket.send_text(json.dumps({"type": "error", "message": "Invalid registration message"}))
+            await websocket.send_text(_dumps({"type": "error", "message": "Invalid registration message"}))
             await websocket.close()
             return False
 
         # Enforce per-API-key connection limit
         conns = self.api_key_connections.get(api_key, [])
         if len(conns) >= self.MAX_CONNECTIONS_PER_KEY:
-            await websocket.send_text(json.dumps({
+            await websocket.send_text(_dumps({
                 "type": "error",
                 "message": f"API key has reached maximum websocket connections ({self.MAX_CONNECTIONS_PER_KEY})"
             }))
@@ -111,13 +116,13 @@ class ConnectionManager:
         logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
 
     async def send_personal_message(self, message: dict, websocket: WebSocket):
-        await websocket.send_text(json.dumps(message))
+        await websocket.send_text(_dumps(message))
 
     async def broadcast(self, message: dict):
         """Broadcast message to all connected clients"""
         for connection in list(self.active_connections):
             try:
-                await connection.send_text(json.dumps(message))
+                await connection.send_text(_dumps(message))
             except Exception as e:
                 logger.error(f"Error broadcasting to client: {str(e)}")
 
@@ -144,8 +149,8 @@ async def websocket_endpoint(websocket: WebSocket):
             data = await websocket.receive_text()
 
             try:
-                message = json.loads(data)
-            except json.JSONDecodeError:
+                message = orjson.loads(data)
+            except orjson.JSONDecodeError:
                 logger.error("Invalid JSON received from websocket client")
                 await manager.send_personal_message({"type": "error", "message": "Invalid JSON"}, websocket)
                 continue
@@ -120,7 +120,22 @@ class BaseBroker(ABC):
 
 class BrokerError(Exception):
     """Base exception for broker-related errors"""
-    pass
+    
+    def __init__(
+        self,
+        message: str = "",
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+    
+    @property
+    def retryable(self) -> bool:
+        """Whether the call may succeed if retried (5xx, 408, 429 or unknown)"""
+        code = self.status_code
+        return code is None or code >= 500 or code in (408, 429)
 
 
 class AuthenticationError(BrokerError):
@@ -351,7 +351,7 @@ class KiteBroker(BaseBroker):
 
         except KiteException as e:
             logger.error(f"Kite API error getting historical data: {str(e)}")
-            raise NetworkError(f"Failed to get historical data: {str(e)}")
+            raise NetworkError(f"Failed to get historical data: {str(e)}", status_code=e.code)
 
         except Exception as e:
             logger.error(f"Unexpected error getting historical data: {str(e)}")
@@ -773,7 +773,13 @@ class KiteBroker(BaseBroker):
     
     # ========== WebSocket Methods ==========
     
-    def connect_websocket(self, on_message_callback, instruments: List[int], mode: str = "full"):
+    def connect_websocket(
+        self,
+        on_message_callback,
+        instruments: List[int],
+        mode: str = "full",
+        on_order_update_callback=None
+    ):
         """
         Connect to Kite WebSocket for real-time market data
         wss://ws.kite.trade?api_key=xxx&access_token=yyy
@@ -783,6 +789,7 @@ class KiteBroker(BaseBroker):
             on_message_callback: Callback function to receive tick data
             instruments: List of instrument tokens to subscribe
             mode: Streaming mode - 'ltp', 'quote', or 'full'
+            on_order_update_callback: Optional callback receiving order postbacks
         
         WebSocket Modes:
             - ltp: Only last traded price (8 bytes)
@@ -838,7 +845,8 @@ class KiteBroker(BaseBroker):
             def on_order_update(ws, data):
                 """Handle order postback updates"""
                 logger.info(f"[KITE WS] 📋 Order update received: {data}")
-                # You can add custom handling for order updates here
+                if on_order_update_callback:
+                    on_order_update_callback(data)
             
             # Attach callbacks
             self.ticker.on_ticks = on_ticks
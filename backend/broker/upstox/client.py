@@ -8,6 +8,14 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _parse_retry_after(response: requests.Response) -> Optional[float]:
+    """Read a Retry-After header given in seconds"""
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
 class UpstoxBroker(BaseBroker):
     """Upstox broker implementation"""
     
@@ -17,6 +25,8 @@ class UpstoxBroker(BaseBroker):
         super().__init__(api_key, api_secret, access_token)
         self.redirect_uri = "http://localhost:8000/api/broker/callback"
         self.headers = {}
+        # Reuse connections across calls instead of a TLS handshake per request
+        self.session = requests.Session()
         if access_token:
             self.headers["Authorization"] = f"Bearer {access_token}"
     
@@ -47,7 +57,7 @@ class UpstoxBroker(BaseBroker):
             }
             headers = {"Content-Type": "application/x-www-form-urlencoded"}
             
-            response = requests.post(url, data=data, headers=headers)
+            response = self.session.post(url, data=data, headers=headers)
             response.raise_for_status()
             
             result = response.json()
@@ -63,7 +73,7 @@ class UpstoxBroker(BaseBroker):
         """Get user profile"""
         try:
             url = f"{self.BASE_URL}/user/profile"
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers)
             response.raise_for_status()
             return response.json().get("data", {})
         except Exception as e:
@@ -74,7 +84,7 @@ class UpstoxBroker(BaseBroker):
         """Get available funds and margins"""
         try:
             url = f"{self.BASE_URL}/user/get-funds-and-margin"
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers)
             response.raise_for_status()
             return response.json().get("data", {})
         except Exception as e:
@@ -98,7 +108,7 @@ class UpstoxBroker(BaseBroker):
         try:
             url = f"{self.BASE_URL}/market-quote/quotes"
             params = {"instrument_key": ",".join(instruments)}
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.session.get(url, headers=self.headers, params=params)
             response.raise_for_status()
             return response.json().get("data", {})
         except Exception as e:
@@ -110,7 +120,7 @@ class UpstoxBroker(BaseBroker):
         try:
             url = f"{self.BASE_URL}/market-quote/ltp"
             params = {"instrument_key": ",".join(instruments)}
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.session.get(url, headers=self.headers, params=params)
             response.raise_for_status()
             
             data = response.json().get("data", {})
@@ -141,7 +151,7 @@ class UpstoxBroker(BaseBroker):
         """Get historical candle data"""
         try:
             url = f"{self.BASE_URL}/historical-candle/{instrument_key}/{interval}/{to_date.strftime('%Y-%m-%d')}/{from_date.strftime('%Y-%m-%d')}"
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers)
             response.raise_for_status()
             
             candles = response.json().get("data", {}).get("candles", [])
@@ -157,6 +167,13 @@ class UpstoxBroker(BaseBroker):
                     "volume": candle[5]
                 })
             return result
+        except requests.HTTPError as e:
+            logger.error(f"Error getting historical data: {str(e)}")
+            raise NetworkError(
+                f"Failed to get historical data: {str(e)}",
+                status_code=e.response.status_code,
+                retry_after=_parse_retry_after(e.response)
+            )
         except Exception as e:
             logger.error(f"Error getting historical data: {str(e)}")
             raise NetworkError(f"Failed to get historical data: {str(e)}")
@@ -186,7 +203,7 @@ class UpstoxBroker(BaseBroker):
             if price is not None and order_type.upper() == "LIMIT":
                 data["price"] = price
             
-            response = requests.post(url, json=data, headers=self.headers)
+            response = self.session.post(url, json=data, headers=self.headers)
             response.raise_for_status()
             
             return response.json().get("data", {})
@@ -213,7 +230,7 @@ class UpstoxBroker(BaseBroker):
             if order_type is not None:
                 data["order_type"] = order_type.upper()
             
-            response = requests.put(url, json=data, headers=self.headers)
+            response = self.session.put(url, json=data, headers=self.headers)
             response.raise_for_status()
             
             return response.json().get("data", {})
@@ -227,7 +244,7 @@ class UpstoxBroker(BaseBroker):
             url = f"{self.BASE_URL}/order/cancel"
             data = {"order_id": order_id}
             
-            response = requests.delete(url, json=data, headers=self.headers)
+            response = self.session.delete(url, json=data, headers=self.headers)
             response.raise_for_status()
             
             return response.json().get("data", {})
@@ -239,7 +256,7 @@ class UpstoxBroker(BaseBroker):
         """Get all orders"""
         try:
             url = f"{self.BASE_URL}/order/retrieve-all"
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers)
             response.raise_for_status()
             return response.json().get("data", [])
         except Exception as e:
@@ -251,7 +268,7 @@ class UpstoxBroker(BaseBroker):
         try:
             url = f"{self.BASE_URL}/order/history"
             params = {"order_id": order_id}
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.session.get(url, headers=self.headers, params=params)
             response.raise_for_status()
             return response.json().get("data", [])
         except Exception as e:
@@ -262,7 +279,7 @@ class UpstoxBroker(BaseBroker):
         """Get current positions"""
         try:
             url = f"{self.BASE_URL}/portfolio/short-term-positions"
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers)
             response.raise_for_status()
             return response.json().get("data", {})
         except Exception as e:
@@ -273,7 +290,7 @@ class UpstoxBroker(BaseBroker):
         """Get holdings"""
         try:
             url = f"{self.BASE_URL}/portfolio/long-term-holdings"
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, headers=self.headers)
             response.raise_for_status()
             return response.json().get("data", [])
         except Exception as e:
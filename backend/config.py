@@ -42,6 +42,8 @@ class Settings(BaseSettings):
     DEFAULT_SELL_TARGET_PERCENTAGE: float = 2.5
     DEFAULT_STRIKE_GAP_POINTS: int = 100
     MARKET_DATA_REFRESH_INTERVAL: int = 1
+    # Indicators run on float32 prices; enable for bit-reproducible float64 backtests
+    INDICATOR_FLOAT64: bool = False
     
     # Security
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
@@ -7,11 +7,16 @@ Numba JIT-compiled functions for ultra-fast trading calculations.
 """
 
 import numpy as np
-from numba import jit, float64, int32, boolean
+from numba import jit, float64, int8, int32, int64, boolean
 import numba as nb
 
+# Scalar kernels on the live order path carry explicit signatures so they are
+# compiled eagerly at import (and cached), never on the first real signal.
+_PRICE = float64(float64, float64, float64)
+_BRACKET = nb.types.UniTuple(float64, 2)(float64, float64, float64, float64)
 
-@jit(nopython=True, fastmath=True, cache=True)
+
+@jit(_PRICE, nopython=True, fastmath=True, cache=True)
 def calculate_limit_buy_price(ltp: float, percentage_below: float, tick_size: float) -> float:
     """
     JIT-compiled LIMIT BUY price calculation.
@@ -28,7 +33,7 @@ def calculate_limit_buy_price(ltp: float, percentage_below: float, tick_size: fl
     return round(buy_price / tick_size) * tick_size
 
 
-@jit(nopython=True, fastmath=True, cache=True)
+@jit(_PRICE, nopython=True, fastmath=True, cache=True)
 def calculate_limit_sell_price(buy_price: float, target_percentage: float, tick_size: float) -> float:
     """
     JIT-compiled LIMIT SELL price calculation.
@@ -45,7 +50,7 @@ def calculate_limit_sell_price(buy_price: float, target_percentage: float, tick_
     return round(sell_price / tick_size) * tick_size
 
 
-@jit(nopython=True, fastmath=True, cache=True)
+@jit(_BRACKET, nopython=True, fastmath=True, cache=True)
 def calculate_bracket_prices(ltp: float,
                            buy_percentage: float,
                            sell_percentage: float,
@@ -71,7 +76,7 @@ def calculate_bracket_prices(ltp: float,
     return buy_price, sell_price
 
 
-@jit(nopython=True, fastmath=True, cache=True)
+@jit(int64(float64, float64, int64, float64), nopython=True, fastmath=True, cache=True)
 def calculate_trade_quantity(capital_available: float,
                            option_price: float,
                            lot_size: int,
@@ -141,6 +146,39 @@ def detect_crossover_signals(price_buffer: np.ndarray,
     return signals
 
 
+@jit(int8[:](float64, float64, float64, float64, float64, float64), nopython=True, cache=True)
+def _detect_crossovers_kernel(cur: float, prev: float,
+                              sma7: float, sma20: float,
+                              lbb: float, ubb: float) -> np.ndarray:
+    """
+    JIT-compiled LTP crossover check against the live indicator levels.
+
+    No fastmath here: a NaN (not yet available) level must compare false.
+
+    Args:
+        cur: Current LTP
+        prev: Previous LTP
+        sma7: 7-period moving average
+        sma20: 20-period moving average
+        lbb: Lower Bollinger Band
+        ubb: Upper Bollinger Band
+
+    Returns:
+        int8 flags for [7ma, 20ma, lbb, ubb] (0=no cross, -1=crossed below, 1=crossed above)
+    """
+    flags = np.zeros(4, dtype=np.int8)
+    levels = (sma7, sma20, lbb, ubb)
+
+    for i in range(4):
+        level = levels[i]
+        if prev >= level and cur < level:
+            flags[i] = -1
+        elif prev <= level and cur > level:
+            flags[i] = 1
+
+    return flags
+
+
 @jit(nopython=True, fastmath=True, cache=True)
 def calculate_moving_averages(price_buffer: np.ndarray, short_period: int, long_period: int):
     """
@@ -217,7 +255,60 @@ def calculate_bollinger_bands(price_buffer: np.ndarray,
     return sma_full, upper_full, lower_full
 
 
-@jit(nopython=True, fastmath=True, cache=True)
+@jit(nopython=True, cache=True)
+def compute_indicators(prices: np.ndarray,
+                       short_period: int = 7,
+                       long_period: int = 20,
+                       bb_period: int = 20,
+                       bb_std: float = 2.0):
+    """
+    JIT-compiled latest-bar MAs and Bollinger Bands in one pass.
+
+    Walks only the trailing window once, accumulating the short and long
+    sums and the band sum of squares (centred on the last price) together.
+    No fastmath here: short input returns NaN, which callers must see intact.
+
+    Args:
+        prices: Price data, oldest first
+        short_period: Short MA period
+        long_period: Long MA period
+        bb_period: Bollinger Band period
+        bb_std: Band width in (population) standard deviations
+
+    Returns:
+        Tuple of (sma_short, sma_long, std, lower_band, upper_band); all NaN
+        when prices is shorter than the longest period
+    """
+    n = len(prices)
+    window = max(short_period, long_period, bb_period)
+    if n < window or window < 1:
+        return np.nan, np.nan, np.nan, np.nan, np.nan
+
+    shift = prices[n - 1]
+    sum_short = 0.0
+    sum_long = 0.0
+    sum_bb = 0.0
+    sumsq_bb = 0.0
+
+    for k in range(window):
+        x = prices[n - 1 - k] - shift
+        if k < short_period:
+            sum_short += x
+        if k < long_period:
+            sum_long += x
+        if k < bb_period:
+            sum_bb += x
+            sumsq_bb += x * x
+
+    bb_mean = sum_bb / bb_period
+    std = np.sqrt(max(sumsq_bb / bb_period - bb_mean * bb_mean, 0.0))
+    middle = bb_mean + shift
+
+    return (sum_short / short_period + shift, sum_long / long_period + shift,
+            std, middle - bb_std * std, middle + bb_std * std)
+
+
+@jit(float64(float64, float64, int64), nopython=True, fastmath=True, cache=True)
 def calculate_pnl(entry_price: float, exit_price: float, quantity: int) -> float:
     """
     JIT-compiled P&L calculation.
@@ -233,7 +324,7 @@ def calculate_pnl(entry_price: float, exit_price: float, quantity: int) -> float
     return (exit_price - entry_price) * quantity
 
 
-@jit(nopython=True, fastmath=True, cache=True)
+@jit(boolean[:](float64, float64, float64), nopython=True, fastmath=True, cache=True)
 def check_position_targets(current_price: float,
                          target_price: float,
                          stoploss_price: float) -> np.ndarray:
@@ -317,8 +408,10 @@ calculate_limit_sell_price(99.5, 2.5, 0.05)
 calculate_bracket_prices(100.0, 0.5, 2.5, 0.05)
 calculate_trade_quantity(10000.0, 100.0, 50, 10.0)
 detect_crossover_signals(_dummy_prices, _dummy_ma7, _dummy_ma20, _dummy_lbb, _dummy_ubb)
+_detect_crossovers_kernel(101.0, 99.0, 100.0, 100.0, 98.0, 102.0)
 calculate_moving_averages(_dummy_prices, 7, 20)
 calculate_bollinger_bands(_dummy_prices)
+compute_indicators(_dummy_prices, 7, 20, 20, 2.0)
 calculate_pnl(100.0, 105.0, 50)
 check_position_targets(105.0, 105.0, 95.0)
 update_price_buffer(_dummy_prices, 103.0)
@@ -1,7 +1,7 @@
 """Main FastAPI application - Configuration via .env file"""
 from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 from backend.config import settings
 from backend.api import (
     broker, webhook, orders,
@@ -29,7 +29,9 @@ app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     debug=settings.DEBUG,
-    redirect_slashes=False
+    redirect_slashes=False,
+    # orjson serializes broker payloads (instruments, candles, quotes) far faster than stdlib json
+    default_response_class=ORJSONResponse
 )
 
 # Register error handlers
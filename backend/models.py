@@ -28,6 +28,8 @@ class Order:
     status = None
 
 class Fund:
+    date = None
+    trade_date = None  # DATE, unique - one entry per trading day
     available = 0
     used = 0
 
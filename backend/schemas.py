@@ -1,13 +1,13 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, List
-from datetime import datetime, time
+from pydantic import BaseModel, Field, PositiveInt, NonNegativeInt, computed_field, SecretStr
+from typing import ClassVar, Optional, Dict, List
+from datetime import datetime, time, date as date_type
 
 
 # Broker Schemas
 class BrokerConfigBase(BaseModel):
     broker_type: str
-    api_key: Optional[str] = None
-    api_secret: Optional[str] = None
+    api_key: Optional[SecretStr] = None
+    api_secret: Optional[SecretStr] = None
     user_id: Optional[str] = None
 
 
@@ -16,15 +16,15 @@ class BrokerConfigCreate(BrokerConfigBase):
 
 
 class BrokerConfigUpdate(BaseModel):
-    api_key: Optional[str] = None
-    api_secret: Optional[str] = None
-    access_token: Optional[str] = None
+    api_key: Optional[SecretStr] = None
+    api_secret: Optional[SecretStr] = None
+    access_token: Optional[SecretStr] = None
     user_id: Optional[str] = None
 
 
 class BrokerConfig(BrokerConfigBase):
-    id: int
-    access_token: Optional[str] = None
+    id: PositiveInt
+    access_token: Optional[SecretStr] = None
     is_active: bool
     token_expires_at: Optional[datetime] = None
     created_at: datetime
@@ -44,8 +44,16 @@ class MarketQuote(BaseModel):
     low: float
     close: float
     volume: int
-    change: float
-    change_percentage: float
+    
+    @computed_field
+    @property
+    def change(self) -> float:
+        return self.last_price - self.close
+    
+    @computed_field
+    @property
+    def change_percentage(self) -> float:
+        return (self.last_price - self.close) / self.close * 100 if self.close else 0.0
 
 
 class MarketDepth(BaseModel):
@@ -72,9 +80,12 @@ class BrokerAuthCallback(BaseModel):
 # Market Time Schemas
 class HolidayResponse(BaseModel):
     """Holiday response from exchange calendar"""
-    date: str
+    date: date_type
     name: str
     description: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
 
 
 class MarketStatusResponse(BaseModel):
@@ -87,12 +98,13 @@ class MarketStatusResponse(BaseModel):
     market_close_time: Optional[str] = None
     exchange: str
     next_trading_day: Optional[str] = None
+    trading_days_mask: int = Field(default=0b0011111, ge=0, lt=128)
 
 
 class TimeUntilResponse(BaseModel):
     """Time until market open/close response"""
     is_open: bool
-    seconds: int
+    seconds: NonNegativeInt
     formatted: str
     opens_at: Optional[str] = None
     closes_at: Optional[str] = None
@@ -107,7 +119,61 @@ class MiddlewareStatus(BaseModel):
     webhook_connected: bool
     webhook_data_flowing: bool
     ltp_fallback_active: bool
-    subscribed_instruments: int
+    subscribed_instruments: NonNegativeInt
     polling_active: bool
 
 
+class MiddlewareStatusFlags(BaseModel):
+    """Unified broker middleware status with booleans packed into one int"""
+    FLAG_RUNNING: ClassVar[int] = 1 << 0
+    FLAG_MARKET_HOURS_ACTIVE: ClassVar[int] = 1 << 1
+    FLAG_WEBHOOK_CONNECTION_TIME: ClassVar[int] = 1 << 2
+    FLAG_WEBHOOK_CONNECTED: ClassVar[int] = 1 << 3
+    FLAG_WEBHOOK_DATA_FLOWING: ClassVar[int] = 1 << 4
+    FLAG_LTP_FALLBACK_ACTIVE: ClassVar[int] = 1 << 5
+    FLAG_POLLING_ACTIVE: ClassVar[int] = 1 << 6
+    
+    status_flags: int = Field(ge=0, lt=128)
+    subscribed_instruments: NonNegativeInt
+    
+    @classmethod
+    def from_status(cls, status: Dict) -> "MiddlewareStatusFlags":
+        """Pack a middleware get_status() dict"""
+        flags = (
+            (cls.FLAG_RUNNING if status['running'] else 0)
+            | (cls.FLAG_MARKET_HOURS_ACTIVE if status['market_hours_active'] else 0)
+            | (cls.FLAG_WEBHOOK_CONNECTION_TIME if status['webhook_connection_time'] else 0)
+            | (cls.FLAG_WEBHOOK_CONNECTED if status['webhook_connected'] else 0)
+            | (cls.FLAG_WEBHOOK_DATA_FLOWING if status['webhook_data_flowing'] else 0)
+            | (cls.FLAG_LTP_FALLBACK_ACTIVE if status['ltp_fallback_active'] else 0)
+            | (cls.FLAG_POLLING_ACTIVE if status['polling_active'] else 0)
+        )
+        return cls(status_flags=flags, subscribed_instruments=status['subscribed_instruments'])
+    
+    @property
+    def running(self) -> bool:
+        return bool(self.status_flags & self.FLAG_RUNNING)
+    
+    @property
+    def market_hours_active(self) -> bool:
+        return bool(self.status_flags & self.FLAG_MARKET_HOURS_ACTIVE)
+    
+    @property
+    def webhook_connection_time(self) -> bool:
+        return bool(self.status_flags & self.FLAG_WEBHOOK_CONNECTION_TIME)
+    
+    @property
+    def webhook_connected(self) -> bool:
+        return bool(self.status_flags & self.FLAG_WEBHOOK_CONNECTED)
+    
+    @property
+    def webhook_data_flowing(self) -> bool:
+        return bool(self.status_flags & self.FLAG_WEBHOOK_DATA_FLOWING)
+    
+    @property
+    def ltp_fallback_active(self) -> bool:
+        return bool(self.status_flags & self.FLAG_LTP_FALLBACK_ACTIVE)
+    
+    @property
+    def polling_active(self) -> bool:
+        return bool(self.status_flags & self.FLAG_POLLING_ACTIVE)
@@ -19,85 +19,595 @@ Features:
 - Websocket integration for real-time data
 """
 
-from typing import Dict, List, Optional, Any, Literal
-from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Any, Literal, Tuple, Union
+from datetime import date, datetime, timedelta
 from sqlalchemy.orm import Session
 import logging
+import os
+import numpy as np
+import pandas as pd
 import asyncio
-from functools import lru_cache
+import hashlib
+import orjson
+import pickle
+import random
+import re
+import requests
+import sqlite3
+from array import array
+from collections import deque
+from concurrent.futures import Future
+import inspect
+from functools import wraps
+import threading
 import time
+import zlib
+from pathlib import Path
+from cachetools import TTLCache
 
 from backend.broker.base import BaseBroker, BrokerError, TokenExpiredError
+from backend.config import settings
 from backend.broker.factory import get_broker_client
+from backend.services.market_calendar import is_market_open
 
 logger = logging.getLogger(__name__)
 
 
+# Columnar layout used for cached candles (prices stay float64 - float32 cannot hold 0.05 ticks at index levels)
+CANDLE_DTYPE = np.dtype([
+    ('ts', 'i8'),
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+    ('volume', 'i8'),
+    ('oi', 'i8'),
+])
+_CANDLE_KEYS = frozenset(('date', 'open', 'high', 'low', 'close', 'volume', 'oi'))
+_EPOCH = datetime(1970, 1, 1)
+# Naive candle times are exchange-local (IST), so 'ts' is always a true epoch
+_EXCHANGE_UTC_OFFSET = 19800
+
+
+class EncodedCandles:
+    """Compressed structured-array cache entry for a list of candles"""
+    
+    __slots__ = ('payload', 'tz', 'has_oi')
+    
+    def __init__(self, payload: bytes, tz, has_oi: bool):
+        self.payload = payload
+        self.tz = tz
+        self.has_oi = has_oi
+    
+    def to_array(self) -> np.ndarray:
+        """Decompress into a read-only CANDLE_DTYPE array"""
+        return np.frombuffer(zlib.decompress(self.payload), dtype=CANDLE_DTYPE)
+    
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Materialize the candles as a list of dicts"""
+        tz = self.tz
+        has_oi = self.has_oi
+        candles = []
+        for ts, open_, high, low, close, volume, oi in self.to_array().tolist():
+            candle = {
+                'date': (
+                    datetime.fromtimestamp(ts, tz) if tz is not None
+                    else _EPOCH + timedelta(seconds=ts + _EXCHANGE_UTC_OFFSET)
+                ),
+                'open': open_,
+                'high': high,
+                'low': low,
+                'close': close,
+                'volume': volume
+            }
+            if has_oi:
+                candle['oi'] = oi
+            candles.append(candle)
+        return candles
+
+
+def _encode_candles(candles: List[Dict[str, Any]]) -> Any:
+    """
+    Encode candles for caching as a compressed structured array
+    
+    Candles that don't fit CANDLE_DTYPE (string dates, extra keys, fractional
+    volume, mixed timezones) are returned unchanged and cached as-is.
+    """
+    if not candles or not isinstance(candles[0].get('date'), datetime):
+        return candles
+    
+    tz = candles[0]['date'].tzinfo
+    has_oi = 'oi' in candles[0]
+    rows = []
+    for candle in candles:
+        date = candle.get('date')
+        volume = candle.get('volume', 0)
+        if (
+            candle.keys() - _CANDLE_KEYS
+            or ('oi' in candle) != has_oi
+            or not isinstance(date, datetime)
+            or date.tzinfo != tz
+            or not isinstance(volume, int)
+        ):
+            return candles
+        ts = (
+            int(date.timestamp()) if tz is not None
+            else int((date - _EPOCH).total_seconds()) - _EXCHANGE_UTC_OFFSET
+        )
+        rows.append((
+            ts, candle['open'], candle['high'], candle['low'], candle['close'],
+            volume, candle.get('oi', 0)
+        ))
+    
+    try:
+        arr = np.array(rows, dtype=CANDLE_DTYPE)
+    except (TypeError, ValueError, OverflowError, KeyError):
+        return candles
+    return EncodedCandles(zlib.compress(arr.tobytes(), 1), tz, has_oi)
+
+
+def _decode_candles(cached: Any) -> List[Dict[str, Any]]:
+    """Reverse _encode_candles"""
+    if isinstance(cached, EncodedCandles):
+        return cached.to_list()
+    return cached
+
+
+def _candles_to_array(cached: Any) -> np.ndarray:
+    """Get a read-only CANDLE_DTYPE array for a cache entry of either form"""
+    if isinstance(cached, EncodedCandles):
+        return cached.to_array()
+    
+    # Payload that didn't fit the compact encoding (e.g. string dates)
+    candles = cached or []
+    arr = np.zeros(len(candles), dtype=CANDLE_DTYPE)
+    if candles:
+        dates = pd.to_datetime([c['date'] for c in candles])
+        if dates.tz is None:
+            dates = dates.tz_localize('Asia/Kolkata')
+        arr['ts'] = dates.as_unit('s').asi8
+        for field in ('open', 'high', 'low', 'close'):
+            arr[field] = [c.get(field) or 0.0 for c in candles]
+        arr['volume'] = [int(c.get('volume') or 0) for c in candles]
+        arr['oi'] = [int(c.get('oi') or 0) for c in candles]
+    arr.flags.writeable = False
+    return arr
+
+
+class SharedBrokerCache:
+    """
+    Cross-process broker data cache backed by a local SQLite file
+    
+    Lets several worker processes on one host share expensive entries
+    (instruments, historical candles) instead of each fetching them from
+    the broker. Expiry uses wall-clock time since it must agree across
+    processes.
+    """
+    
+    DEFAULT_PATH = Path("config") / "broker_cache.db"
+    
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or self.DEFAULT_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS broker_cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get cached value if not expired"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM broker_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return self._loads(row[0]) if row else None
+    
+    def set(self, key: str, value: Any, ttl: int):
+        """Set cached value with a TTL in seconds"""
+        payload = self._dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO broker_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, payload, time.time() + ttl)
+            )
+            self._conn.commit()
+    
+    def invalidate(self, key: str):
+        """Invalidate specific cache key"""
+        with self._lock:
+            self._conn.execute("DELETE FROM broker_cache WHERE key = ?", (key,))
+            self._conn.commit()
+    
+    def invalidate_pattern(self, pattern: str, prefix: str = ''):
+        """Invalidate all keys starting with prefix and containing pattern"""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM broker_cache WHERE key LIKE ? ESCAPE '\\'",
+                (f"{self._escape_like(prefix)}%{self._escape_like(pattern)}%",)
+            )
+            self._conn.commit()
+    
+    def clear(self, prefix: str = ''):
+        """Clear entire cache, or only the keys starting with prefix"""
+        if prefix:
+            self.invalidate_pattern('', prefix)
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM broker_cache")
+            self._conn.commit()
+    
+    @staticmethod
+    def _escape_like(text: str) -> str:
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    
+    @staticmethod
+    def _dumps(value: Any) -> bytes:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    @staticmethod
+    def _loads(payload: bytes) -> Any:
+        return pickle.loads(payload)
+
+
 class BrokerDataCache:
     """Thread-safe cache for broker data with TTL"""
     
-    def __init__(self):
-        self._cache = {}
-        self._cache_timestamps = {}
+    MAX_ENTRIES_PER_BUCKET = 1024
+    
+    # Prefixes that are also stored in the shared cache when one is configured
+    SHARED_PREFIXES = ('instruments', 'historical')
+    
+    def __init__(self, shared: Optional[SharedBrokerCache] = None, shared_namespace: str = ''):
+        self._shared = shared
+        # Shared keys are prefixed so brokers/accounts never read each other's entries
+        self._shared_prefix = f"{shared_namespace}:"
         self._default_ttl = {
             'instruments': 3600,      # 1 hour - instruments don't change often
             'profile': 3600,          # 1 hour
             'funds': 60,              # 1 minute
             'positions': 30,          # 30 seconds
             'orders': 10,             # 10 seconds
+            'holdings': 300,          # 5 minutes
             'ltp': 1,                 # 1 second
             'quote': 2,               # 2 seconds
+            'ohlc': 2,                # 2 seconds
             'historical_minute': 60,  # 1 minute for minute candles
             'historical_day': 3600,   # 1 hour for day candles
+            'negative': 5,            # 5 seconds for instruments the broker had no data for
+            'market_window': 60,      # 1 minute - open/close boundary needn't be rechecked more often
         }
+        # One bounded LRU+TTL bucket per key prefix, each guarded by its own lock so
+        # LTP ticks never wait on an orders/positions refresh (lock striping by prefix).
+        # Expiry runs on integer monotonic nanoseconds, immune to wall-clock/NTP steps.
+        self._buckets = {
+            prefix: (self._new_bucket(ttl), threading.RLock())
+            for prefix, ttl in self._default_ttl.items()
+        }
+        self._default_bucket = (self._new_bucket(60), threading.RLock())
+        # Keys are '<prefix>_<rest>'; prefixes that themselves contain '_'
+        # (historical_minute, market_window) take one more token
+        self._compound_heads = frozenset(
+            prefix.partition('_')[0] for prefix in self._default_ttl if '_' in prefix
+        )
+    
+    @classmethod
+    def _new_bucket(cls, ttl_seconds: int) -> TTLCache:
+        return TTLCache(
+            maxsize=cls.MAX_ENTRIES_PER_BUCKET,
+            ttl=ttl_seconds * 1_000_000_000,
+            timer=time.monotonic_ns
+        )
     
     def get(self, key: str, ttl: Optional[int] = None) -> Optional[Any]:
-        """Get cached value if not expired"""
-        if key not in self._cache:
-            return None
-        
-        # Check if expired
-        cache_time = self._cache_timestamps.get(key, 0)
-        if ttl is None:
-            # Auto-detect TTL from key prefix
-            ttl = self._get_ttl_from_key(key)
+        """
+        Get cached value if not expired
         
-        if time.time() - cache_time > ttl:
-            # Expired
-            self._cache.pop(key, None)
-            self._cache_timestamps.pop(key, None)
-            return None
+        ttl is accepted for backward compatibility; expiry is governed by
+        the TTL of the bucket the key prefix maps to.
+        """
+        bucket, lock = self._get_bucket(key)
+        with lock:
+            value = bucket.get(key)
         
-        return self._cache[key]
+        if value is None and self._is_shared(key):
+            value = self._shared.get(self._shared_prefix + key)
+            if value is not None:
+                with lock:
+                    bucket[key] = value
+        return value
     
     def set(self, key: str, value: Any):
         """Set cached value"""
-        self._cache[key] = value
-        self._cache_timestamps[key] = time.time()
+        bucket, lock = self._get_bucket(key)
+        with lock:
+            bucket[key] = value
+        
+        if self._is_shared(key):
+            self._shared.set(self._shared_prefix + key, value, ttl=bucket.ttl // 1_000_000_000)
     
     def invalidate(self, key: str):
         """Invalidate specific cache key"""
-        self._cache.pop(key, None)
-        self._cache_timestamps.pop(key, None)
+        bucket, lock = self._get_bucket(key)
+        with lock:
+            bucket.pop(key, None)
+        
+        if self._is_shared(key):
+            self._shared.invalidate(self._shared_prefix + key)
     
     def invalidate_pattern(self, pattern: str):
         """Invalidate all keys matching pattern"""
-        keys_to_remove = [k for k in self._cache.keys() if pattern in k]
-        for key in keys_to_remove:
-            self._cache.pop(key, None)
-            self._cache_timestamps.pop(key, None)
+        if self._shared is not None:
+            self._shared.invalidate_pattern(pattern, self._shared_prefix)
+        
+        entry = self._buckets.get(pattern)
+        if entry is not None:
+            # Pattern is a bucket prefix - drop the whole bucket
+            bucket, lock = entry
+            with lock:
+                bucket.clear()
+            # Negative entries are stored as negative_<prefix>_<instrument>
+            self._invalidate_in_bucket(self._buckets['negative'], f'negative_{pattern}_')
+            return
+        
+        for entry in (*self._buckets.values(), self._default_bucket):
+            self._invalidate_in_bucket(entry, pattern)
+    
+    @staticmethod
+    def _invalidate_in_bucket(entry: Tuple[TTLCache, threading.RLock], pattern: str):
+        """Remove keys containing pattern from a single bucket"""
+        bucket, lock = entry
+        with lock:
+            keys_to_remove = [k for k in bucket.keys() if pattern in k]
+            for key in keys_to_remove:
+                bucket.pop(key, None)
     
     def clear(self):
         """Clear entire cache"""
-        self._cache.clear()
-        self._cache_timestamps.clear()
+        # Buckets are cleared one at a time under their own lock, so no lock ordering is needed
+        for bucket, lock in (*self._buckets.values(), self._default_bucket):
+            with lock:
+                bucket.clear()
+        
+        if self._shared is not None:
+            self._shared.clear(self._shared_prefix)
+    
+    def _is_shared(self, key: str) -> bool:
+        """Check if a key belongs to a tier kept in the shared cache"""
+        return self._shared is not None and key.partition('_')[0] in self.SHARED_PREFIXES
+    
+    def _key_prefix(self, key: str) -> str:
+        """Extract the bucket prefix of a key with a single split"""
+        head, _, rest = key.partition('_')
+        if head in self._compound_heads:
+            return f"{head}_{rest.partition('_')[0]}"
+        return head
+    
+    def _get_bucket(self, key: str) -> Tuple[TTLCache, threading.RLock]:
+        """Get the bucket and its lock for a key based on its prefix"""
+        return self._buckets.get(self._key_prefix(key), self._default_bucket)
     
     def _get_ttl_from_key(self, key: str) -> int:
         """Get TTL based on key prefix"""
-        for prefix, ttl in self._default_ttl.items():
-            if key.startswith(prefix):
-                return ttl
-        return 60  # Default 60 seconds
+        return self._default_ttl.get(self._key_prefix(key), 60)
+
+
+def broker_account_scope(broker: BaseBroker) -> Optional[str]:
+    """
+    Name the broker login that cached data belongs to
+    
+    Combines the broker, the configured user id and a digest of the access
+    token, so switching broker, user or login never serves another login's
+    persisted profile or instruments.
+    
+    Returns:
+        '<broker>_<user_id>_<token digest>', or None when not logged in
+    """
+    if not broker.access_token:
+        return None
+    name = type(broker).__name__.removesuffix('Broker').lower()
+    user_id = getattr(settings, f"{name.upper()}_USER_ID", None) or 'user'
+    digest = hashlib.sha256(broker.access_token.encode()).hexdigest()[:16]
+    return f"{name}_{re.sub(r'[^A-Za-z0-9]', '', user_id)}_{digest}"
+
+
+def purge_disk_cache():
+    """Delete all persisted broker cache files (call on login, logout or broker change)"""
+    for pattern in ("*.json.z", "*.pkl.z"):
+        for path in BrokerDataService.DISK_CACHE_DIR.glob(pattern):
+            path.unlink(missing_ok=True)
+
+
+class InstrumentSearchIndex:
+    """
+    Trigram inverted index over instrument symbols and names
+    
+    Uppercased fields are computed once per instruments list instead of on
+    every search, and terms of 3+ characters only verify instruments whose
+    fields contain all of the term's trigrams. Shorter terms and the
+    instrument type filter run over NumPy string columns.
+    """
+    
+    def __init__(self, instruments: List[Dict[str, Any]]):
+        self.instruments = instruments
+        self.symbols = [inst.get('tradingsymbol', '').upper() for inst in instruments]
+        self.names = [inst.get('name', '').upper() for inst in instruments]
+        
+        # Columnar copies for vectorized scans
+        self.symbols_arr = np.array(self.symbols, dtype=str)
+        self.names_arr = np.array(self.names, dtype=str)
+        self.types_arr = np.array([inst.get('instrument_type') or '' for inst in instruments], dtype=str)
+        
+        postings: Dict[str, array] = {}
+        for idx, (symbol, name) in enumerate(zip(self.symbols, self.names)):
+            for gram in self._trigrams(symbol) | self._trigrams(name):
+                ids = postings.get(gram)
+                if ids is None:
+                    ids = postings[gram] = array('i')
+                ids.append(idx)
+        self.postings = postings
+    
+    @staticmethod
+    def _trigrams(text: str) -> set:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+    
+    def search(self, term: str, instrument_type: Optional[str] = None) -> List[int]:
+        """Get indexes of instruments whose symbol or name contains term (uppercased)"""
+        if len(term) < 3:
+            mask = (np.char.find(self.symbols_arr, term) >= 0) | (np.char.find(self.names_arr, term) >= 0)
+            if instrument_type:
+                mask &= self.types_arr == instrument_type
+            return np.flatnonzero(mask).tolist()
+        
+        # Intersect postings starting from the rarest trigram
+        posting_lists = sorted(
+            (self.postings.get(gram, ()) for gram in self._trigrams(term)),
+            key=len
+        )
+        candidates = set(posting_lists[0])
+        for ids in posting_lists[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(ids)
+        
+        symbols = self.symbols
+        names = self.names
+        types = self.types_arr
+        return [
+            idx for idx in sorted(candidates)
+            if (term in symbols[idx] or term in names[idx])
+            and (not instrument_type or types[idx] == instrument_type)
+        ]
+
+
+class TickDispatcher:
+    """
+    Hands websocket ticks from the broker thread to a consumer thread
+    
+    The broker thread only appends to a bounded buffer, so a slow callback
+    can't stall the websocket. On overflow the oldest batch is dropped -
+    ticks are replaceable and the latest state is what matters.
+    """
+    
+    MAX_PENDING = 1024
+    DROP_LOG_INTERVAL = 1.0
+    
+    def __init__(self, callback: Callable[[Any], None], max_pending: int = MAX_PENDING):
+        self._callback = callback
+        self._buffer = deque(maxlen=max_pending)
+        self._ready = threading.Condition(threading.Lock())
+        self._running = True
+        self._last_drop_log = 0.0
+        self.dropped_ticks = 0
+        self._thread = threading.Thread(target=self._run, name="tick-dispatcher", daemon=True)
+        self._thread.start()
+    
+    def push(self, ticks: Any):
+        """Queue a tick batch (runs on the broker thread, never waits on the consumer)"""
+        with self._ready:
+            if len(self._buffer) == self._buffer.maxlen:
+                dropped = self._buffer[0]
+                self.dropped_ticks += len(dropped) if isinstance(dropped, list) else 1
+                now = time.monotonic()
+                if now - self._last_drop_log >= self.DROP_LOG_INTERVAL:
+                    self._last_drop_log = now
+                    logger.warning(f"Tick consumer falling behind, {self.dropped_ticks} ticks dropped")
+            self._buffer.append(ticks)
+            self._ready.notify()
+    
+    def stop(self):
+        """Stop the consumer thread, discarding pending ticks"""
+        with self._ready:
+            self._running = False
+            self._buffer.clear()
+            self._ready.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+    
+    def _run(self):
+        while True:
+            with self._ready:
+                while self._running and not self._buffer:
+                    self._ready.wait()
+                if not self._running:
+                    return
+                ticks = self._buffer.popleft()
+            
+            try:
+                self._callback(ticks)
+            except Exception as e:
+                logger.error(f"Error in tick callback: {e}")
+
+
+def cached_broker_call(
+    key: Optional[Union[str, Callable[[Dict[str, Any]], str]]],
+    what: str
+):
+    """
+    Wrap a BrokerDataService fetch with caching and broker error handling
+    
+    The decorated method only calls the broker. When it takes a use_cache
+    argument, cache hits are served from BrokerDataCache and misses go
+    through single-flight and are stored. TokenExpiredError propagates
+    as-is and any other failure is raised as BrokerError.
+    
+    Args:
+        key: Cache key, a function of the call arguments (by name, defaults
+             applied) returning one, or None for calls that are never cached
+        what: Name of the data used in log and error messages
+    """
+    def decorator(fetch: Callable) -> Callable:
+        # Positional index (after self) and default of each parameter, resolved
+        # once here so calls avoid Signature.bind on the hot path
+        slots = {
+            name: (index, param.default)
+            for index, (name, param) in enumerate(
+                list(inspect.signature(fetch).parameters.items())[1:]
+            )
+        }
+        use_cache_slot = slots.get('use_cache')
+        
+        def argument(args: tuple, kwargs: Dict[str, Any], name: str, slot: Tuple[int, Any]) -> Any:
+            if name in kwargs:
+                return kwargs[name]
+            index, default = slot
+            return args[index] if index < len(args) else default
+        
+        @wraps(fetch)
+        def wrapper(self, *args, **kwargs):
+            if callable(key):
+                cache_key = key({name: argument(args, kwargs, name, slot) for name, slot in slots.items()})
+            else:
+                cache_key = key
+            
+            use_cache = use_cache_slot is not None and argument(args, kwargs, 'use_cache', use_cache_slot)
+            if cache_key and self.cache and use_cache:
+                cached = self.cache.get(cache_key)
+                if cached:
+                    logger.debug(f"{what.capitalize()} retrieved from cache")
+                    return cached
+            
+            try:
+                if cache_key is None:
+                    return fetch(self, *args, **kwargs)
+                result = self._single_flight(cache_key, lambda: fetch(self, *args, **kwargs))
+                if self.cache:
+                    self.cache.set(cache_key, result)
+                return result
+            except TokenExpiredError:
+                # Re-raise token expiry errors to propagate to engine
+                raise
+
+            except Exception as e:
+                logger.error(f"Error fetching {what}: {e}")
+                raise BrokerError(f"Failed to fetch {what}: {e}")
+        
+        return wrapper
+    return decorator
 
 
 class BrokerDataService:
@@ -111,11 +621,22 @@ class BrokerDataService:
     - Mode-aware data fetching
     """
     
+    # Window during which concurrent get_ltp_batched() calls are merged into one broker call
+    LTP_BATCH_WINDOW = 0.005
+    
+    # Slow-changing data persisted across restarts, with max file age in seconds
+    DISK_CACHE_DIR = Path("config") / "broker_cache"
+    DISK_CACHE_TTL = {
+        'profile': 24 * 3600,
+        'instruments': 3600,
+    }
+    
     def __init__(
         self,
         broker: BaseBroker,
         mode: Literal['backtest', 'paper', 'live'] = 'live',
-        enable_cache: bool = True
+        enable_cache: bool = True,
+        shared_cache: Optional[SharedBrokerCache] = None
     ):
         """
         Initialize broker data service
@@ -124,15 +645,116 @@ class BrokerDataService:
             broker: Broker client instance
             mode: Trading mode - 'backtest', 'paper', or 'live'
             enable_cache: Whether to enable caching
+            shared_cache: Optional cross-process cache for instruments/historical data
         """
         self.broker = broker
         self.mode = mode
-        self.cache = BrokerDataCache() if enable_cache else None
+        # Broker login this service's persisted/shared entries belong to (None: not logged in)
+        self._account_scope = broker_account_scope(broker)
+        if self._account_scope is None:
+            shared_cache = None
+        self.cache = (
+            BrokerDataCache(shared=shared_cache, shared_namespace=self._account_scope or '')
+            if enable_cache else None
+        )
         self._websocket_active = False
+        self._tick_dispatcher: Optional[TickDispatcher] = None
+        # Order book kept current from websocket order postbacks while connected
+        self._orders_by_id: Optional[Dict[str, Dict[str, Any]]] = None
+        self._orders_lock = threading.Lock()
         self._websocket_callbacks = []
         
+        # In-flight broker calls keyed by cache key (single-flight)
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        
+        # Search indexes keyed by exchange, rebuilt when the instruments list changes
+        self._search_indexes: Dict[str, InstrumentSearchIndex] = {}
+        
+        # Pending get_ltp_batched() requests, flushed as one broker call per window
+        self._ltp_pending: Dict[str, asyncio.Future] = {}
+        self._ltp_flush_task: Optional[asyncio.Task] = None
+        
         logger.info(f"BrokerDataService initialized in '{mode}' mode")
     
+    def _disk_cache_path(self, key: str) -> Optional[Path]:
+        """Persisted file for key, named for the broker login it was fetched under"""
+        if self._account_scope is None:
+            return None
+        return self.DISK_CACHE_DIR / f"{key}_{self._account_scope}.json.z"
+    
+    def _read_disk_cache(self, key: str, ttl: int) -> Optional[Any]:
+        """Load a persisted entry if its file is younger than ttl seconds"""
+        path = self._disk_cache_path(key)
+        if path is None:
+            return None
+        try:
+            if time.time() - path.stat().st_mtime >= ttl:
+                return None
+            with open(path, 'rb') as f:
+                return orjson.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable disk cache {path}: {e}")
+            return None
+    
+    def _write_disk_cache(self, key: str, value: Any):
+        """Persist an entry atomically so readers never see a partial file"""
+        path = self._disk_cache_path(key)
+        if path is None:
+            return
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            self.DISK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(zlib.compress(orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY), 1))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write disk cache {path}: {e}")
+    
+    def _filter_negative(self, kind: str, instruments: List[str], use_cache: bool) -> List[str]:
+        """Drop instruments the broker recently returned no data for (cached reads only)"""
+        if not use_cache or not self.cache:
+            return instruments
+        return [inst for inst in instruments if self.cache.get(f'negative_{kind}_{inst}') is None]
+    
+    def _record_negative(self, kind: str, requested: List[str], response: Dict[str, Any]):
+        """Remember requested instruments missing from a broker response"""
+        if not self.cache:
+            return
+        for inst in requested:
+            if inst not in response:
+                self.cache.set(f'negative_{kind}_{inst}', True)
+    
+    def _single_flight(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Run fetch once for all concurrent callers of the same key
+        
+        The first caller performs the broker call; callers arriving while it is
+        in flight wait for and share its result (or exception).
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[key] = future
+        
+        if not is_leader:
+            return future.result()
+        
+        try:
+            result = fetch()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+    
     # ========== User Profile & Authentication ==========
     
     def get_profile(self, use_cache: bool = True) -> Dict[str, Any]:
@@ -152,11 +774,18 @@ class BrokerDataService:
             if cached:
                 logger.debug("Profile retrieved from cache")
                 return cached
+            
+            persisted = self._read_disk_cache(cache_key, self.DISK_CACHE_TTL['profile'])
+            if persisted:
+                logger.debug("Profile retrieved from disk cache")
+                self.cache.set(cache_key, persisted)
+                return persisted
         
         try:
-            profile = self.broker.get_profile()
+            profile = self._single_flight(cache_key, self.broker.get_profile)
             if self.cache:
                 self.cache.set(cache_key, profile)
+                self._write_disk_cache(cache_key, profile)
             logger.info(f"Profile fetched for user: {profile.get('user_id')}")
             return profile
         except TokenExpiredError:
@@ -169,6 +798,7 @@ class BrokerDataService:
     
     # ========== Funds & Margins ==========
     
+    @cached_broker_call(lambda call: f'funds_{call["segment"] or "all"}', 'funds')
     def get_funds(self, segment: Optional[str] = None, use_cache: bool = True) -> Dict[str, Any]:
         """
         Get available funds and margins
@@ -180,27 +810,9 @@ class BrokerDataService:
         Returns:
             Dict with enabled, net, available, utilised margins
         """
-        cache_key = f'funds_{segment or "all"}'
-        
-        if use_cache and self.cache:
-            cached = self.cache.get(cache_key)
-            if cached:
-                logger.debug("Funds retrieved from cache")
-                return cached
-        
-        try:
-            funds = self.broker.get_funds(segment=segment)
-            if self.cache:
-                self.cache.set(cache_key, funds)
-            logger.info(f"Funds fetched: {funds}")
-            return funds
-        except TokenExpiredError:
-            # Re-raise token expiry errors to propagate to engine
-            raise
-
-        except Exception as e:
-            logger.error(f"Error fetching funds: {e}")
-            raise BrokerError(f"Failed to fetch funds: {e}")
+        funds = self.broker.get_funds(segment=segment)
+        logger.info(f"Funds fetched: {funds}")
+        return funds
     
     # ========== Instruments ==========
     
@@ -226,11 +838,25 @@ class BrokerDataService:
             if cached:
                 logger.debug(f"Instruments retrieved from cache for {exchange or 'all'}")
                 return cached
+            
+            persisted = self._read_disk_cache(cache_key, self.DISK_CACHE_TTL['instruments'])
+            if persisted:
+                # JSON holds expiry dates as ISO strings; restore what the broker returns
+                for inst in persisted:
+                    if inst.get('expiry'):
+                        inst['expiry'] = date.fromisoformat(inst['expiry'])
+                logger.debug(f"Instruments retrieved from disk cache for {exchange or 'all'}")
+                self.cache.set(cache_key, persisted)
+                return persisted
         
         try:
-            instruments = self.broker.get_instruments(exchange=exchange)
+            instruments = self._single_flight(
+                cache_key,
+                lambda: self.broker.get_instruments(exchange=exchange)
+            )
             if self.cache:
                 self.cache.set(cache_key, instruments)
+                self._write_disk_cache(cache_key, instruments)
             logger.info(f"Fetched {len(instruments)} instruments for {exchange or 'all exchanges'}")
             return instruments
         except TokenExpiredError:
@@ -260,20 +886,15 @@ class BrokerDataService:
         """
         instruments = self.get_instruments(exchange=exchange)
         
-        # Filter by search term
-        search_term = search_term.upper()
-        results = [
-            inst for inst in instruments
-            if search_term in inst.get('tradingsymbol', '').upper()
-            or search_term in inst.get('name', '').upper()
-        ]
+        index_key = exchange or 'all'
+        index = self._search_indexes.get(index_key)
+        if index is None or index.instruments is not instruments:
+            index = InstrumentSearchIndex(instruments)
+            self._search_indexes[index_key] = index
         
-        # Filter by instrument type
-        if instrument_type:
-            results = [
-                inst for inst in results
-                if inst.get('instrument_type') == instrument_type
-            ]
+        # Filter by search term and instrument type
+        search_term = search_term.upper()
+        results = [instruments[idx] for idx in index.search(search_term, instrument_type)]
         
         logger.debug(f"Found {len(results)} instruments matching '{search_term}'")
         return results
@@ -304,7 +925,9 @@ class BrokerDataService:
                 return cached
         
         try:
-            ltp_data = self.broker.get_ltp(instruments)
+            to_fetch = self._filter_negative('ltp', instruments, use_cache)
+            ltp_data = self.broker.get_ltp(to_fetch) if to_fetch else {}
+            self._record_negative('ltp', to_fetch, ltp_data)
             
             # Extract just the LTP values
             result = {}
@@ -327,6 +950,78 @@ class BrokerDataService:
             logger.error(f"Error fetching LTP: {e}")
             raise BrokerError(f"Failed to fetch LTP: {e}")
     
+    def get_ltp_array(
+        self,
+        instruments: List[str],
+        use_cache: bool = False,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Get last traded prices aligned to the instrument list
+        
+        Numeric consumers can pass the same preallocated out array on every
+        tick instead of building a result dict each time.
+        
+        Args:
+            instruments: List of instrument symbols in "EXCHANGE:SYMBOL" format
+            use_cache: Whether to use cached data (default False for live prices)
+            out: Optional float64 array of len(instruments) to fill in place
+            
+        Returns:
+            Array of LTPs, NaN where the broker returned no price
+        """
+        if out is None:
+            out = np.empty(len(instruments), dtype=np.float64)
+        elif out.shape != (len(instruments),):
+            raise ValueError(f"out must have shape ({len(instruments)},), got {out.shape}")
+        
+        prices = self.get_ltp(instruments, use_cache=use_cache)
+        for i, inst in enumerate(instruments):
+            out[i] = prices.get(inst, np.nan)
+        return out
+    
+    async def get_ltp_batched(self, instrument: str) -> Optional[float]:
+        """
+        Get LTP for a single instrument, coalescing concurrent requests
+        
+        Calls made within LTP_BATCH_WINDOW of each other are served by a
+        single get_ltp() broker call covering all requested instruments.
+        
+        Args:
+            instrument: Instrument symbol in "EXCHANGE:SYMBOL" format
+            
+        Returns:
+            LTP, or None if the broker returned no data for the instrument
+        """
+        loop = asyncio.get_running_loop()
+        future = self._ltp_pending.get(instrument)
+        if future is None:
+            future = loop.create_future()
+            self._ltp_pending[instrument] = future
+            if self._ltp_flush_task is None:
+                self._ltp_flush_task = loop.create_task(self._flush_ltp())
+        
+        # Shield so one cancelled caller doesn't cancel the shared result
+        return await asyncio.shield(future)
+    
+    async def _flush_ltp(self):
+        """Resolve all pending get_ltp_batched() requests with one broker call"""
+        await asyncio.sleep(self.LTP_BATCH_WINDOW)
+        pending, self._ltp_pending = self._ltp_pending, {}
+        self._ltp_flush_task = None
+        
+        try:
+            result = await asyncio.to_thread(self.get_ltp, list(pending))
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for inst, future in pending.items():
+            if not future.done():
+                future.set_result(result.get(inst))
+    
     def get_quote(
         self,
         instruments: List[str],
@@ -351,7 +1046,9 @@ class BrokerDataService:
                 return cached
         
         try:
-            quotes = self.broker.get_quote(instruments)
+            to_fetch = self._filter_negative('quote', instruments, use_cache)
+            quotes = self.broker.get_quote(to_fetch) if to_fetch else {}
+            self._record_negative('quote', to_fetch, quotes)
             if self.cache:
                 self.cache.set(cache_key, quotes)
             logger.debug(f"Fetched quotes for {len(instruments)} instruments")
@@ -364,6 +1061,7 @@ class BrokerDataService:
             logger.error(f"Error fetching quotes: {e}")
             raise BrokerError(f"Failed to fetch quotes: {e}")
     
+    @cached_broker_call(lambda call: f'ohlc_{"_".join(call["instruments"])}', 'OHLC')
     def get_ohlc(
         self,
         instruments: List[str],
@@ -379,17 +1077,9 @@ class BrokerDataService:
         Returns:
             Dict with OHLC data
         """
-        try:
-            ohlc_data = self.broker.get_ohlc(instruments)
-            logger.debug(f"Fetched OHLC for {len(instruments)} instruments")
-            return ohlc_data
-        except TokenExpiredError:
-            # Re-raise token expiry errors to propagate to engine
-            raise
-
-        except Exception as e:
-            logger.error(f"Error fetching OHLC: {e}")
-            raise BrokerError(f"Failed to fetch OHLC: {e}")
+        ohlc_data = self.broker.get_ohlc(instruments)
+        logger.debug(f"Fetched OHLC for {len(instruments)} instruments")
+        return ohlc_data
     
     # ========== Historical Data ==========
     
@@ -425,6 +1115,50 @@ class BrokerDataService:
             "Use middleware.get_historical_data() instead for centralized handling."
         )
         
+        candles, cached = self._load_historical(instrument_token, from_date, to_date, interval, use_cache)
+        return candles if candles is not None else _decode_candles(cached)
+    
+    def get_historical_data_array(
+        self,
+        instrument_token: str,
+        from_date: datetime,
+        to_date: datetime,
+        interval: str = "minute",
+        use_cache: bool = True
+    ) -> np.ndarray:
+        """
+        Get historical candles as a read-only structured array
+        
+        Skips materializing one dict per candle. Fields follow CANDLE_DTYPE,
+        with 'ts' as epoch seconds.
+        
+        Args:
+            instrument_token: Instrument token
+            from_date: Start date
+            to_date: End date
+            interval: Candle interval
+            use_cache: Whether to use cached data
+            
+        Returns:
+            Read-only array with ts, open, high, low, close, volume, oi
+        """
+        _, cached = self._load_historical(instrument_token, from_date, to_date, interval, use_cache)
+        return _candles_to_array(cached)
+    
+    def _load_historical(
+        self,
+        instrument_token: str,
+        from_date: datetime,
+        to_date: datetime,
+        interval: str,
+        use_cache: bool
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Any]:
+        """
+        Fetch historical candles through the cache
+        
+        Returns:
+            (candles, cache entry) - candles is None when served from cache
+        """
         # Delegate to broker directly with simple caching
         cache_key = f'historical_{interval}_{instrument_token}_{from_date.date()}_{to_date.date()}'
         
@@ -433,29 +1167,37 @@ class BrokerDataService:
             cached = self.cache.get(cache_key, ttl=ttl)
             if cached:
                 logger.debug(f"Historical data retrieved from cache for {instrument_token}")
-                return cached
+                return None, cached
         
         try:
-            candles = self.broker.get_historical_data(
-                instrument_token=instrument_token,
-                from_date=from_date,
-                to_date=to_date,
-                interval=interval
+            candles = self._single_flight(
+                cache_key,
+                lambda: self.broker.get_historical_data(
+                    instrument_token=instrument_token,
+                    from_date=from_date,
+                    to_date=to_date,
+                    interval=interval
+                )
             )
             
+            encoded = _encode_candles(candles)
             if self.cache:
-                self.cache.set(cache_key, candles)
+                self.cache.set(cache_key, encoded)
             
             logger.info(
                 f"Fetched {len(candles)} {interval} candles for {instrument_token} "
                 f"from {from_date.date()} to {to_date.date()}"
             )
-            return candles
+            return candles, encoded
         except TokenExpiredError:
             raise
         except Exception as e:
             logger.error(f"Error fetching historical data: {e}")
-            raise BrokerError(f"Failed to fetch historical data: {e}")
+            raise BrokerError(
+                f"Failed to fetch historical data: {e}",
+                status_code=getattr(e, 'status_code', None),
+                retry_after=getattr(e, 'retry_after', None)
+            )
     
     def get_historical_data_with_retry(
         self,
@@ -464,22 +1206,30 @@ class BrokerDataService:
         to_date: datetime,
         interval: str = "minute",
         max_retries: int = 3,
-        retry_delay: int = 2
+        retry_delay: float = 2,
+        max_delay: float = 30
     ) -> List[Dict[str, Any]]:
         """
         Get historical data with retry logic
         
+        Waits use decorrelated jitter so parallel workers don't retry in
+        lockstep after a rate limit. A broker Retry-After takes precedence,
+        and errors that can't succeed on retry (4xx other than 408/429) are
+        raised immediately.
+        
         Args:
             instrument_token: Instrument token
             from_date: Start date
             to_date: End date
             interval: Candle interval
             max_retries: Maximum retry attempts
-            retry_delay: Delay between retries in seconds
+            retry_delay: Base delay between retries in seconds
+            max_delay: Upper bound for a single delay in seconds
             
         Returns:
             List of candles
         """
+        delay = retry_delay
         for attempt in range(max_retries):
             try:
                 return self.get_historical_data(
@@ -489,13 +1239,23 @@ class BrokerDataService:
                     interval=interval,
                     use_cache=True
                 )
+            except TokenExpiredError:
+                raise
             except Exception as e:
+                if isinstance(e, BrokerError) and not e.retryable:
+                    logger.error(f"Non-retryable error for historical data: {e}")
+                    raise
                 if attempt < max_retries - 1:
+                    retry_after = getattr(e, 'retry_after', None)
+                    if retry_after is not None:
+                        delay = min(max_delay, retry_after)
+                    else:
+                        delay = random.uniform(retry_delay, min(max_delay, delay * 3))
                     logger.warning(
                         f"Attempt {attempt + 1} failed for historical data, "
-                        f"retrying in {retry_delay}s: {e}"
+                        f"retrying in {delay:.1f}s: {e}"
                     )
-                    time.sleep(retry_delay)
+                    time.sleep(delay)
                 else:
                     logger.error(f"All {max_retries} attempts failed for historical data")
                     raise
@@ -650,6 +1410,7 @@ class BrokerDataService:
             logger.error(f"Error cancelling order: {e}")
             raise BrokerError(f"Failed to cancel order: {e}")
     
+    @cached_broker_call('orders_all', 'orders')
     def get_orders(self, use_cache: bool = False) -> List[Dict[str, Any]]:
         """
         Get all orders for the day
@@ -660,28 +1421,15 @@ class BrokerDataService:
         Returns:
             List of orders
         """
-        cache_key = 'orders_all'
-        
-        if use_cache and self.cache:
-            cached = self.cache.get(cache_key, ttl=10)
-            if cached:
-                logger.debug("Orders retrieved from cache")
-                return cached
+        with self._orders_lock:
+            if self._orders_by_id is not None:
+                return list(self._orders_by_id.values())
         
-        try:
-            orders = self.broker.get_orders()
-            if self.cache:
-                self.cache.set(cache_key, orders)
-            logger.debug(f"Fetched {len(orders)} orders")
-            return orders
-        except TokenExpiredError:
-            # Re-raise token expiry errors to propagate to engine
-            raise
-
-        except Exception as e:
-            logger.error(f"Error fetching orders: {e}")
-            raise BrokerError(f"Failed to fetch orders: {e}")
+        orders = self.broker.get_orders()
+        logger.debug(f"Fetched {len(orders)} orders")
+        return orders
     
+    @cached_broker_call(None, 'order history')
     def get_order_history(self, order_id: str) -> List[Dict[str, Any]]:
         """
         Get order history
@@ -692,20 +1440,13 @@ class BrokerDataService:
         Returns:
             List of order state changes
         """
-        try:
-            history = self.broker.get_order_history(order_id)
-            logger.debug(f"Fetched history for order {order_id}")
-            return history
-        except TokenExpiredError:
-            # Re-raise token expiry errors to propagate to engine
-            raise
-
-        except Exception as e:
-            logger.error(f"Error fetching order history: {e}")
-            raise BrokerError(f"Failed to fetch order history: {e}")
+        history = self.broker.get_order_history(order_id)
+        logger.debug(f"Fetched history for order {order_id}")
+        return history
     
     # ========== Positions ==========
     
+    @cached_broker_call('positions', 'positions')
     def get_positions(self, use_cache: bool = False) -> Dict[str, Any]:
         """
         Get current positions
@@ -716,31 +1457,13 @@ class BrokerDataService:
         Returns:
             Dict with 'net' and 'day' positions
         """
-        cache_key = 'positions'
-        
-        if use_cache and self.cache:
-            cached = self.cache.get(cache_key, ttl=30)
-            if cached:
-                logger.debug("Positions retrieved from cache")
-                return cached
-        
-        try:
-            positions = self.broker.get_positions()
-            if self.cache:
-                self.cache.set(cache_key, positions)
-            
-            net_count = len(positions.get('net', []))
-            day_count = len(positions.get('day', []))
-            logger.debug(f"Fetched {net_count} net positions and {day_count} day positions")
-            return positions
-        except TokenExpiredError:
-            # Re-raise token expiry errors to propagate to engine
-            raise
-
-        except Exception as e:
-            logger.error(f"Error fetching positions: {e}")
-            raise BrokerError(f"Failed to fetch positions: {e}")
+        positions = self.broker.get_positions()
+        net_count = len(positions.get('net', []))
+        day_count = len(positions.get('day', []))
+        logger.debug(f"Fetched {net_count} net positions and {day_count} day positions")
+        return positions
     
+    @cached_broker_call('holdings', 'holdings')
     def get_holdings(self, use_cache: bool = True) -> List[Dict[str, Any]]:
         """
         Get holdings (long-term positions)
@@ -751,27 +1474,9 @@ class BrokerDataService:
         Returns:
             List of holdings
         """
-        cache_key = 'holdings'
-        
-        if use_cache and self.cache:
-            cached = self.cache.get(cache_key, ttl=300)
-            if cached:
-                logger.debug("Holdings retrieved from cache")
-                return cached
-        
-        try:
-            holdings = self.broker.get_holdings()
-            if self.cache:
-                self.cache.set(cache_key, holdings)
-            logger.debug(f"Fetched {len(holdings)} holdings")
-            return holdings
-        except TokenExpiredError:
-            # Re-raise token expiry errors to propagate to engine
-            raise
-
-        except Exception as e:
-            logger.error(f"Error fetching holdings: {e}")
-            raise BrokerError(f"Failed to fetch holdings: {e}")
+        holdings = self.broker.get_holdings()
+        logger.debug(f"Fetched {len(holdings)} holdings")
+        return holdings
     
     # ========== WebSocket ==========
     
@@ -794,28 +1499,57 @@ class BrokerDataService:
             return
         
         # Check if market is open before connecting
-        from backend.services.market_calendar import is_market_open
-        
-        if not is_market_open():
+        if not self._market_window_active():
             logger.info("Market is closed - WebSocket connection deferred")
             return
         
+        # Run the callback off the broker thread so slow consumers can't stall it
+        if self._tick_dispatcher:
+            self._tick_dispatcher.stop()
+        self._tick_dispatcher = TickDispatcher(on_tick_callback)
+        
         try:
+            stream_kwargs = {}
+            if 'on_order_update_callback' in inspect.signature(self.broker.connect_websocket).parameters:
+                # Snapshot the order book before subscribing so postbacks only ever overwrite it
+                try:
+                    self._seed_order_book()
+                    stream_kwargs['on_order_update_callback'] = self._on_order_update
+                except TokenExpiredError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Order book snapshot failed, orders will be polled: {e}")
+            
             self.broker.connect_websocket(
-                on_message_callback=on_tick_callback,
+                on_message_callback=self._tick_dispatcher.push,
                 instruments=instruments,
-                mode=mode
+                mode=mode,
+                **stream_kwargs
             )
             self._websocket_active = True
             logger.info(f"✓ WebSocket connected for {len(instruments)} instruments in {mode} mode")
         except TokenExpiredError:
+            self._stop_tick_dispatcher()
+            self._drop_order_book()
             # Re-raise token expiry errors to propagate to engine
             raise
 
         except Exception as e:
+            self._stop_tick_dispatcher()
+            self._drop_order_book()
             logger.error(f"Error connecting websocket: {e}")
             raise BrokerError(f"Failed to connect websocket: {e}")
     
+    def _market_window_active(self) -> bool:
+        """Check the market window, reusing a positive result for a minute"""
+        if self.cache and self.cache.get('market_window_active'):
+            return True
+        
+        active = is_market_open()
+        if active and self.cache:
+            self.cache.set('market_window_active', True)
+        return active
+    
     def disconnect_websocket(self):
         """Disconnect websocket"""
         if not self._websocket_active:
@@ -827,6 +1561,45 @@ class BrokerDataService:
             logger.info("WebSocket disconnected")
         except Exception as e:
             logger.error(f"Error disconnecting websocket: {e}")
+        finally:
+            self._stop_tick_dispatcher()
+            self._drop_order_book()
+    
+    def _seed_order_book(self):
+        """Load the day's orders that postbacks will keep current"""
+        orders = self.broker.get_orders()
+        with self._orders_lock:
+            self._orders_by_id = {order['order_id']: order for order in orders}
+        logger.debug(f"Order book seeded with {len(orders)} orders")
+    
+    def _drop_order_book(self):
+        """Fall back to REST polling for orders"""
+        with self._orders_lock:
+            self._orders_by_id = None
+    
+    def _on_order_update(self, update: Dict[str, Any]):
+        """Apply an order postback (runs on the broker's websocket thread)"""
+        order_id = update.get('order_id')
+        if not order_id:
+            return
+        
+        with self._orders_lock:
+            if self._orders_by_id is not None:
+                self._orders_by_id[order_id] = {**self._orders_by_id.get(order_id, {}), **update}
+        
+        if self.cache:
+            self.cache.invalidate_pattern('orders')
+            # Fills change positions; drop the cached snapshot rather than serve it stale
+            if update.get('filled_quantity'):
+                self.cache.invalidate_pattern('positions')
+    
+    def _stop_tick_dispatcher(self):
+        """Stop the tick consumer thread if one is running"""
+        if self._tick_dispatcher:
+            if self._tick_dispatcher.dropped_ticks:
+                logger.info(f"Tick dispatcher dropped {self._tick_dispatcher.dropped_ticks} ticks")
+            self._tick_dispatcher.stop()
+            self._tick_dispatcher = None
     
     # ========== Cache Management ==========
     
@@ -834,6 +1607,7 @@ class BrokerDataService:
         """Clear all cached data"""
         if self.cache:
             self.cache.clear()
+            purge_disk_cache()
             logger.info("Cache cleared")
     
     def invalidate_cache(self, pattern: str):
@@ -843,10 +1617,46 @@ class BrokerDataService:
             logger.debug(f"Invalidated cache for pattern: {pattern}")
 
 
+_shared_broker_cache: Optional[SharedBrokerCache] = None
+
+
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+# Keep-alive pool sized for startup bursts of historical requests
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 32
+
+
+def _get_http_session() -> requests.Session:
+    """Get the process-wide pooled HTTPS session shared by broker clients"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                pool_maxsize=HTTP_POOL_MAXSIZE
+            )
+            session.mount("https://", adapter)
+            _http_session = session
+        return _http_session
+
+
+def _attach_http_session(broker: BaseBroker) -> None:
+    """Point the broker SDK at the shared keep-alive session"""
+    session = _get_http_session()
+    if hasattr(broker, 'kite'):
+        broker.kite.reqsession = session
+    elif hasattr(broker, 'session'):
+        broker.session = session
+
+
 def get_broker_data_service(
     db: Session,
     mode: Literal['backtest', 'paper', 'live'] = 'live',
-    enable_cache: bool = True
+    enable_cache: bool = True,
+    shared_cache: bool = False
 ) -> BrokerDataService:
     """
     Factory function to get BrokerDataService instance
@@ -855,9 +1665,19 @@ def get_broker_data_service(
         db: Database session
         mode: Trading mode
         enable_cache: Whether to enable caching
+        shared_cache: Whether to share instruments/historical data across processes
         
     Returns:
         BrokerDataService instance
     """
+    global _shared_broker_cache
     broker = get_broker_client(db, raise_exception=True)
-    return BrokerDataService(broker=broker, mode=mode, enable_cache=enable_cache)
+    _attach_http_session(broker)
+    
+    shared = None
+    if enable_cache and shared_cache:
+        if _shared_broker_cache is None:
+            _shared_broker_cache = SharedBrokerCache()
+        shared = _shared_broker_cache
+    
+    return BrokerDataService(broker=broker, mode=mode, enable_cache=enable_cache, shared_cache=shared)
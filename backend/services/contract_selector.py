@@ -1,12 +1,60 @@
 """Option contract selection logic for Nifty options"""
 from typing import Optional, Dict, List
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from sqlalchemy.orm import Session
+from cachetools import TTLCache
 from backend.models import Instrument
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Contract reference data is static intraday; memoize lookups across selectors.
+# Keys carry a generation so an instrument refresh invalidates everything at once.
+CONTRACT_CACHE_TTL = 300
+_expiry_cache: TTLCache = TTLCache(maxsize=64, ttl=CONTRACT_CACHE_TTL)
+_contract_cache: TTLCache = TTLCache(maxsize=4096, ttl=CONTRACT_CACHE_TTL)
+_cache_lock = threading.Lock()
+_cache_generation = 0
+
+
+# Kite encodes weekly expiries as YY + month code + DD (NIFTY25N0426000CE)
+# and monthly expiries as YY + MON (NIFTY25NOV26000CE)
+_WEEKLY_MONTH_CODES = "123456789OND"
+_MONTH_ABBREVIATIONS = ("JAN", "FEB", "MAR", "APR", "MAY", "JUN",
+                        "JUL", "AUG", "SEP", "OCT", "NOV", "DEC")
+
+
+def option_tradingsymbols(index: str, expiry: str, strike, option_type: str) -> List[str]:
+    """
+    Build the exact tradingsymbols an option contract can carry
+    
+    Args:
+        index: Index name (NIFTY, BANKNIFTY)
+        expiry: Expiry date string (YYYY-MM-DD)
+        strike: Strike price
+        option_type: CE or PE
+        
+    Returns:
+        [weekly symbol, monthly symbol]
+    """
+    expiry_date = date.fromisoformat(str(expiry)[:10])
+    strike_text = str(int(strike)) if float(strike).is_integer() else str(strike)
+    year = f"{expiry_date.year % 100:02d}"
+    return [
+        f"{index}{year}{_WEEKLY_MONTH_CODES[expiry_date.month - 1]}{expiry_date.day:02d}{strike_text}{option_type}",
+        f"{index}{year}{_MONTH_ABBREVIATIONS[expiry_date.month - 1]}{strike_text}{option_type}",
+    ]
+
+
+def invalidate_contract_cache():
+    """Drop memoized expiries and contracts (call after refreshing instruments)"""
+    global _cache_generation
+    with _cache_lock:
+        _cache_generation += 1
+        _expiry_cache.clear()
+        _contract_cache.clear()
+
 
 class ContractSelector:
     """Select appropriate option contracts based on strategy"""
@@ -22,24 +70,29 @@ class ContractSelector:
     
     def get_nearest_expiry(self, index: str) -> Optional[str]:
         """Get nearest expiry date for the given index"""
+        with _cache_lock:
+            generation = _cache_generation
+            key = (generation, index, date.today())
+            if key in _expiry_cache:
+                return _expiry_cache[key]
+        
+        expiry = self._query_nearest_expiry(index)
+        if expiry is not None:
+            with _cache_lock:
+                # Skip the store if the cache was invalidated mid-query
+                if generation == _cache_generation:
+                    _expiry_cache[key] = expiry
+        return expiry
+    
+    def _query_nearest_expiry(self, index: str) -> Optional[str]:
         try:
-            # Query instruments for the index with expiry dates
-            instruments = self.db.query(Instrument).filter(
+            # Let the database pick the earliest upcoming expiry instead of
+            # loading every strike for the index; expiry is stored as ISO text
+            return self.db.query(Instrument.expiry).filter(
                 Instrument.name.like(f"%{index}%"),
-                Instrument.expiry.isnot(None)
-            ).all()
-            
-            if not instruments:
-                return None
-            
-            # Get unique expiry dates and sort
-            expiry_dates = sorted(set(inst.expiry for inst in instruments if inst.expiry))
-            
-            if not expiry_dates:
-                return None
-            
-            # Return nearest expiry
-            return expiry_dates[0]
+                Instrument.expiry.isnot(None),
+                Instrument.expiry >= date.today().isoformat()
+            ).order_by(Instrument.expiry.asc()).limit(1).scalar()
             
         except Exception as e:
             logger.error(f"Error getting nearest expiry: {e}")
@@ -64,8 +117,47 @@ class ContractSelector:
         Returns:
             Instrument object or None
         """
+        with _cache_lock:
+            generation = _cache_generation
+            key = (generation, index, expiry, strike, option_type)
+            instrument_id = _contract_cache.get(key)
+        if instrument_id is not None:
+            try:
+                # Primary-key lookup, served from the session identity map when loaded
+                contract = self.db.get(Instrument, instrument_id)
+                if contract is not None:
+                    return contract
+            except Exception as e:
+                logger.error(f"Error loading cached option contract: {e}")
+        
+        contract = self._query_option_contract(index, expiry, strike, option_type)
+        if contract is not None:
+            with _cache_lock:
+                if generation == _cache_generation:
+                    _contract_cache[key] = contract.id
+        return contract
+    
+    def _query_option_contract(
+        self,
+        index: str,
+        expiry: str,
+        strike: int,
+        option_type: str
+    ) -> Optional[Instrument]:
         try:
-            # Build tradingsymbol pattern
+            # Probe the tradingsymbol index with the exact weekly/monthly symbols
+            try:
+                symbols = option_tradingsymbols(index, expiry, strike, option_type)
+            except (TypeError, ValueError):
+                symbols = None
+            
+            if symbols:
+                return self.db.query(Instrument).filter(
+                    Instrument.tradingsymbol.in_(symbols),
+                    Instrument.expiry == expiry
+                ).first()
+            
+            # Unparseable expiry: fall back to a pattern match
             # Example: NIFTY25N0426000CE
             symbol_pattern = f"{index}%{strike}{option_type}"
             
@@ -1,69 +1,149 @@
 """Fund allocation and management"""
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from cachetools import TTLCache
+from sqlalchemy import event, func, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from backend.models import Fund, Position
 from backend.config import settings
 from datetime import datetime, date
+import asyncio
 import logging
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# (available balance, utilised margin); None where the broker payload has no value
+FundFigures = Tuple[Optional[float], Optional[float]]
+
+
+def _parse_kite_funds(broker_funds: Any) -> FundFigures:
+    """Extract balance and margin from a Kite /user/margins response"""
+    try:
+        equity = broker_funds["equity"]
+    except (KeyError, TypeError):
+        return None, 0
+    
+    try:
+        available_balance = equity["available"]["live_balance"]
+    except (KeyError, TypeError):
+        available_balance = None
+    
+    try:
+        utilized_margin = equity["utilised"]["debits"]
+    except (KeyError, TypeError):
+        utilized_margin = 0
+    
+    return available_balance, utilized_margin
+
+
+def _parse_generic_funds(broker_funds: Any) -> FundFigures:
+    """Brokers without a known funds format leave the fund figures untouched"""
+    return None, None
+
+
+# Fund parsers by broker class name, resolved once per FundManager
+FUND_PARSERS: Dict[str, Callable[[Any], FundFigures]] = {
+    'KiteBroker': _parse_kite_funds,
+}
+
 
 class FundManager:
     """Manage fund allocation and P&L calculations"""
     
+    # Instruments per LTP request, well within broker per-call limits
+    LTP_BATCH_SIZE = 500
+    # Broker funds/LTP responses are reused for this long to debounce polling
+    BROKER_CACHE_TTL = 5
+    
     def __init__(self, db: Session, broker_client):
         self.db = db
         self.broker = broker_client
+        self._parse_funds = FUND_PARSERS.get(type(broker_client).__name__, _parse_generic_funds)
         self.max_fund_per_trade_pct = settings.MAX_FUND_PERCENTAGE_PER_TRADE
+        # Today's fund row, reused until the date rolls over. The session is the
+        # caller's, so its expire_on_commit is left alone; after a commit the row
+        # reloads by primary key on next access instead of re-running the date query
+        self._fund_cache: Optional[Tuple[date, Fund]] = None
+        self._funds_cache: TTLCache = TTLCache(maxsize=128, ttl=self.BROKER_CACHE_TTL)
+        self._ltp_cache: TTLCache = TTLCache(maxsize=128, ttl=self.BROKER_CACHE_TTL)
+        # Open-position count, so a flat book skips the positions query and LTP call.
+        # Dropped whenever this session flushes Position changes; the TTL bounds how
+        # long positions opened through other sessions can go unnoticed. The flush
+        # listener holds a reference to this manager until close() is called.
+        self._open_count_cache: TTLCache = TTLCache(maxsize=1, ttl=self.BROKER_CACHE_TTL)
+        event.listen(self.db, 'after_flush', self._on_flush)
+    
+    def close(self):
+        """Detach from the session so it no longer keeps this manager alive"""
+        if event.contains(self.db, 'after_flush', self._on_flush):
+            event.remove(self.db, 'after_flush', self._on_flush)
+    
+    def __enter__(self) -> "FundManager":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
     
     def get_or_create_today_fund(self) -> Fund:
         """Get or create fund entry for today"""
         today = date.today()
-        fund = self.db.query(Fund).filter(
-            Fund.date >= datetime.combine(today, datetime.min.time()),
-            Fund.date < datetime.combine(today, datetime.max.time())
-        ).first()
+        if self._fund_cache and self._fund_cache[0] == today:
+            return self._fund_cache[1]
+        
+        # Point lookup on the unique trade_date key
+        fund = self.db.query(Fund).filter(Fund.trade_date == today).first()
         
         if not fund:
-            # Create new fund entry
-            try:
-                broker_funds = self.broker.get_funds()
-                
-                # Extract available balance (broker-specific logic)
-                if hasattr(broker_funds, 'get'):
-                    # Kite format
-                    equity = broker_funds.get("equity", {})
-                    available_balance = equity.get("available", {}).get("live_balance", 0)
-                else:
-                    # Generic format
-                    available_balance = 0
-                
-                fund = Fund(
-                    date=datetime.now(),
-                    opening_balance=available_balance,
-                    available_balance=available_balance,
-                    utilized_margin=0.0,
-                    floating_pnl=0.0,
-                    realized_pnl=0.0,
-                    charges=0.0
-                )
-                self.db.add(fund)
-                self.db.commit()
-                self.db.refresh(fund)
-                
-            except Exception as e:
-                logger.error(f"Error creating fund entry: {str(e)}")
-                # Fallback with default values
-                fund = Fund(
-                    date=datetime.now(),
-                    opening_balance=0,
-                    available_balance=0
-                )
-                self.db.add(fund)
-                self.db.commit()
-                self.db.refresh(fund)
+            fund = self._create_today_fund(today)
+        
+        self._fund_cache = (today, fund)
+        return fund
+    
+    def _get_broker_funds(self) -> Dict:
+        """Fetch broker funds, reusing a response younger than BROKER_CACHE_TTL"""
+        funds = self._funds_cache.get('funds')
+        if funds is None:
+            funds = self.broker.get_funds()
+            self._funds_cache['funds'] = funds
+        return funds
+    
+    def _create_today_fund(self, today: date) -> Fund:
+        """Create fund entry for today, deferring to a concurrent insert if one wins"""
+        try:
+            available_balance, _ = self._parse_funds(self._get_broker_funds())
+            if available_balance is None:
+                available_balance = 0
+            
+            fund = Fund(
+                trade_date=today,
+                date=datetime.now(),
+                opening_balance=available_balance,
+                available_balance=available_balance,
+                utilized_margin=0.0,
+                floating_pnl=0.0,
+                realized_pnl=0.0,
+                charges=0.0
+            )
+        except Exception as e:
+            logger.error(f"Error creating fund entry: {str(e)}")
+            # Fallback with default values
+            fund = Fund(
+                trade_date=today,
+                date=datetime.now(),
+                opening_balance=0,
+                available_balance=0
+            )
         
+        self.db.add(fund)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # trade_date is unique - another worker created today's entry first
+            self.db.rollback()
+            return self.db.query(Fund).filter(Fund.trade_date == today).one()
+        
+        self.db.refresh(fund)
         return fund
     
     def update_fund_from_broker(self) -> Fund:
@@ -71,68 +151,160 @@ class FundManager:
         fund = self.get_or_create_today_fund()
         
         try:
-            broker_funds = self.broker.get_funds()
+            available_balance, utilized_margin = self._parse_funds(self._get_broker_funds())
             
             # Update available balance
-            if hasattr(broker_funds, 'get'):
-                equity = broker_funds.get("equity", {})
-                fund.available_balance = equity.get("available", {}).get("live_balance", fund.available_balance)
-                fund.utilized_margin = equity.get("utilised", {}).get("debits", 0)
+            if available_balance is not None:
+                fund.available_balance = available_balance
+            if utilized_margin is not None:
+                fund.utilized_margin = utilized_margin
             
             self.db.commit()
-            self.db.refresh(fund)
             
         except Exception as e:
             logger.error(f"Error updating fund from broker: {str(e)}")
         
         return fund
     
+    def _on_flush(self, session, flush_context):
+        """Forget the open-position count once this session writes a Position"""
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            if isinstance(obj, Position):
+                self._open_count_cache.clear()
+                return
+    
+    def _open_position_count(self) -> int:
+        """Number of open positions, counted at most once per BROKER_CACHE_TTL"""
+        count = self._open_count_cache.get('open')
+        if count is None:
+            count = self.db.query(func.count(Position.id)).filter(
+                Position.closed_at.is_(None)
+            ).scalar() or 0
+            self._open_count_cache['open'] = count
+        return count
+    
     def calculate_floating_pnl(self, broker_client) -> float:
         """Calculate floating P&L from open positions"""
         try:
-            positions = self.db.query(Position).filter(
-                Position.closed_at.is_(None)
-            ).all()
+            if self._open_position_count() == 0:
+                return 0.0
             
+            positions = self._get_open_positions()
             if not positions:
                 return 0.0
             
             # Get current prices
-            instrument_keys = [pos.instrument_token for pos in positions]
-            ltp_data = broker_client.get_ltp(instrument_keys)
+            instrument_keys = tuple(pos.instrument_token for pos in positions)
+            ltp_data = self._ltp_cache.get(instrument_keys)
+            if ltp_data is None:
+                ltp_data = broker_client.get_ltp(list(instrument_keys))
+                self._ltp_cache[instrument_keys] = ltp_data
+            return self._apply_floating_pnl(positions, ltp_data)
             
-            total_pnl = 0.0
-            for position in positions:
-                current_price = ltp_data.get(position.instrument_token, position.last_price)
-                pnl = (current_price - position.average_price) * position.quantity
-                total_pnl += pnl
-                
-                # Update position
-                position.last_price = current_price
-                position.pnl = pnl
-                position.pnl_percentage = (pnl / (position.average_price * position.quantity)) * 100
+        except Exception as e:
+            logger.error(f"Error calculating floating P&L: {str(e)}")
+            return 0.0
+    
+    async def calculate_floating_pnl_async(self, broker_client) -> float:
+        """Calculate floating P&L, fetching LTP batches concurrently off the event loop"""
+        try:
+            if self._open_position_count() == 0:
+                return 0.0
             
-            self.db.commit()
-            return total_pnl
+            positions = self._get_open_positions()
+            if not positions:
+                return 0.0
+            
+            instrument_keys = tuple(pos.instrument_token for pos in positions)
+            ltp_data = self._ltp_cache.get(instrument_keys)
+            if ltp_data is None:
+                ltp_data = await self._fetch_ltps(broker_client, list(instrument_keys))
+                self._ltp_cache[instrument_keys] = ltp_data
+            return self._apply_floating_pnl(positions, ltp_data)
             
         except Exception as e:
             logger.error(f"Error calculating floating P&L: {str(e)}")
             return 0.0
     
+    async def _fetch_ltps(self, broker_client, instrument_keys: List[str]) -> Dict[str, float]:
+        """Fetch LTPs in broker-sized batches, overlapping the round trips"""
+        batches = [
+            instrument_keys[i:i + self.LTP_BATCH_SIZE]
+            for i in range(0, len(instrument_keys), self.LTP_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(
+            *(asyncio.to_thread(broker_client.get_ltp, batch) for batch in batches)
+        )
+        
+        ltp_data = {}
+        for result in results:
+            ltp_data.update(result)
+        return ltp_data
+    
+    def _get_open_positions(self) -> List:
+        """Load the open-position columns needed for P&L"""
+        # Plain rows are enough since the write-back goes through bulk_update_mappings
+        positions = self.db.query(
+            Position.id,
+            Position.instrument_token,
+            Position.average_price,
+            Position.quantity,
+            Position.last_price
+        ).filter(
+            Position.closed_at.is_(None)
+        ).all()
+        self._open_count_cache['open'] = len(positions)
+        return positions
+    
+    def _apply_floating_pnl(self, positions: List, ltp_data: Dict[str, float]) -> float:
+        """Mark positions to the given prices and return total floating P&L"""
+        count = len(positions)
+        avg = np.fromiter((pos.average_price for pos in positions), dtype=np.float64, count=count)
+        qty = np.fromiter((pos.quantity for pos in positions), dtype=np.float64, count=count)
+        ltp = np.fromiter(
+            (ltp_data.get(pos.instrument_token, pos.last_price) for pos in positions),
+            dtype=np.float64, count=count
+        )
+        
+        pnl = (ltp - avg) * qty
+        # Zero-cost legs get 0% instead of failing the whole update
+        cost = avg * qty
+        pnl_pct = np.where(cost != 0, pnl / np.where(cost == 0, 1.0, cost) * 100, 0.0)
+        
+        # Write back in one bulk UPDATE instead of per-object change tracking
+        self.db.bulk_update_mappings(Position, [
+            {'id': pos.id, 'last_price': last_price, 'pnl': pos_pnl, 'pnl_percentage': pct}
+            for pos, last_price, pos_pnl, pct in zip(positions, ltp.tolist(), pnl.tolist(), pnl_pct.tolist())
+        ])
+        self.db.commit()
+        return float(pnl.sum())
+    
     def update_floating_pnl(self, broker_client) -> Fund:
         """Update fund with floating P&L"""
         fund = self.get_or_create_today_fund()
         fund.floating_pnl = self.calculate_floating_pnl(broker_client)
         self.db.commit()
-        self.db.refresh(fund)
         return fund
     
-    def calculate_max_trade_amount(self) -> float:
-        """Calculate maximum amount that can be allocated to one trade (16% rule)"""
-        fund = self.get_or_create_today_fund()
+    def calculate_max_trade_amount(
+        self,
+        fund: Optional[Fund] = None,
+        floating_pnl: Optional[float] = None
+    ) -> float:
+        """
+        Calculate maximum amount that can be allocated to one trade (16% rule)
+        
+        Args:
+            fund: Today's fund entry, if the caller already has it
+            floating_pnl: Freshly computed floating P&L to use instead of the stored value
+        """
+        if fund is None:
+            fund = self.get_or_create_today_fund()
+        if floating_pnl is None:
+            floating_pnl = fund.floating_pnl
         
         # Calculate current fund value
-        current_fund = fund.opening_balance + fund.realized_pnl + fund.floating_pnl - fund.charges
+        current_fund = fund.opening_balance + fund.realized_pnl + floating_pnl - fund.charges
         
         max_amount = current_fund * (self.max_fund_per_trade_pct / 100.0)
         return max_amount
@@ -147,8 +319,8 @@ class FundManager:
         Returns:
             True if trade can be placed, False otherwise
         """
-        max_amount = self.calculate_max_trade_amount()
         fund = self.get_or_create_today_fund()
+        max_amount = self.calculate_max_trade_amount(fund)
         
         # Check if required amount is within limit
         if required_amount > max_amount:
@@ -169,14 +341,25 @@ class FundManager:
     
     def record_trade_charges(self, charges: float):
         """Record trading charges (brokerage, taxes, etc.)"""
-        fund = self.get_or_create_today_fund()
-        fund.charges += charges
-        self.db.commit()
+        self._increment_today_fund(charges=charges)
     
     def record_realized_pnl(self, pnl: float):
         """Record realized P&L from closed position"""
-        fund = self.get_or_create_today_fund()
-        fund.realized_pnl += pnl
+        self._increment_today_fund(realized_pnl=pnl)
+    
+    def _increment_today_fund(self, **deltas: float):
+        """
+        Add to columns of today's fund entry with one atomic UPDATE
+        
+        The increment happens in SQL, so concurrent fills can't lose updates
+        and the ORM skips dirty-checking the whole row.
+        """
+        today = self.get_or_create_today_fund().trade_date
+        self.db.execute(
+            update(Fund)
+            .where(Fund.trade_date == today)
+            .values({column: getattr(Fund, column) + delta for column, delta in deltas.items()})
+        )
         self.db.commit()
     
     def get_fund_summary(self, broker_client) -> Dict:
@@ -185,7 +368,7 @@ class FundManager:
         floating_pnl = self.calculate_floating_pnl(broker_client)
         
         current_value = fund.opening_balance + fund.realized_pnl + floating_pnl - fund.charges
-        max_trade_amount = self.calculate_max_trade_amount()
+        max_trade_amount = self.calculate_max_trade_amount(fund, floating_pnl)
         
         return {
             "opening_balance": fund.opening_balance,
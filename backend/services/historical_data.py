@@ -11,15 +11,44 @@ Features:
 - Support for multiple symbols and timeframes
 """
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Callable
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import List, Dict, Iterator, Optional, Callable, Tuple
 import asyncio
-import pytz
+from functools import lru_cache
+from operator import itemgetter
+from zoneinfo import ZoneInfo
+import numpy as np
+import pandas as pd
+from backend.services.market_calendar import get_market_calendar
 
 logger = logging.getLogger(__name__)
 
-# IST timezone
-IST = pytz.timezone('Asia/Kolkata')
+# IST timezone (stdlib zoneinfo: C-backed, no localize/normalize needed)
+IST = ZoneInfo('Asia/Kolkata')
+
+
+# Broker candle fields copied into columns, in transposition order
+_CANDLE_FIELDS = itemgetter('date', 'open', 'high', 'low', 'close')
+
+
+def candle_count(data: Dict[str, np.ndarray]) -> int:
+    """Number of candles in a columnar candle set"""
+    return len(data['ltp']) if data else 0
+
+
+@lru_cache(maxsize=64)
+def _recent_trading_day(today: date, days_back: int) -> date:
+    """Trading day on or before ``today - days_back`` (memoized per day and offset)"""
+    calendar = get_market_calendar()
+    target = today - timedelta(days=days_back)
+    
+    # Find previous trading day
+    while not calendar.is_trading_day(target):
+        target -= timedelta(days=1)
+    
+    return target
 
 
 class HistoricalDataService:
@@ -30,6 +59,22 @@ class HistoricalDataService:
     ensuring centralized rate limiting, caching, and error handling.
     """
     
+    # Completed trading days never change, so their candles are kept on disk
+    CACHE_DIR = Path("config") / "historical_cache"
+    # On-disk shard layout: one record per candle, memory-mapped on load
+    SHARD_DTYPE = np.dtype([
+        ('timestamp', 'M8[ns]'),
+        ('open', 'f8'),
+        ('high', 'f8'),
+        ('low', 'f8'),
+        ('close', 'f8'),
+        ('volume', 'i8'),
+    ])
+    # Ticks the replay clock may run ahead of a slow callback before it waits
+    REPLAY_QUEUE_SIZE = 1000
+    # Columns replay reads; ltp is restored from close
+    REPLAY_COLUMNS = ('timestamp', 'open', 'high', 'low', 'close')
+    
     def __init__(self, middleware):
         """
         Initialize historical data service
@@ -48,7 +93,7 @@ class HistoricalDataService:
         start_date: datetime,
         end_date: datetime,
         interval: str = "minute"
-    ) -> List[Dict]:
+    ) -> Dict[str, np.ndarray]:
         """
         Fetch historical data from broker API via middleware
         
@@ -65,7 +110,8 @@ class HistoricalDataService:
             interval: Data interval (minute, 3minute, 5minute, 15minute, etc.)
         
         Returns:
-            List of candles: [{timestamp, open, high, low, close, volume, ltp}, ...]
+            Columnar candles: {timestamp, open, high, low, close, ltp, volume} -> array,
+            with timestamp as IST wall-clock datetime64[ns]; empty dict if no data
         """
         try:
             logger.info(f"Fetching historical data for {symbol} from {start_date} to {end_date}")
@@ -81,22 +127,30 @@ class HistoricalDataService:
             
             if not data:
                 logger.warning(f"No historical data received for {symbol}")
-                return []
+                return {}
             
-            # Transform data to include LTP (use close price)
-            transformed_data = []
-            for candle in data:
-                transformed_data.append({
-                    'timestamp': candle['date'],
-                    'open': float(candle['open']),
-                    'high': float(candle['high']),
-                    'low': float(candle['low']),
-                    'close': float(candle['close']),
-                    'ltp': float(candle['close']),
-                    'volume': int(candle.get('volume', 0))
-                })
+            # Transform to contiguous columns with LTP (use close price). The rows are
+            # transposed in one C-level pass and each column is coerced as a whole,
+            # skipping DataFrame's per-row key inference.
+            dates, opens, highs, lows, closes = zip(*map(_CANDLE_FIELDS, data))
+            timestamps = pd.DatetimeIndex(dates)
+            if timestamps.tz is not None:
+                timestamps = timestamps.tz_convert(IST).tz_localize(None)
+            close = np.array(closes, dtype=np.float64)
+            transformed_data = {
+                'timestamp': timestamps.to_numpy(dtype='datetime64[ns]'),
+                'open': np.array(opens, dtype=np.float64),
+                'high': np.array(highs, dtype=np.float64),
+                'low': np.array(lows, dtype=np.float64),
+                'close': close,
+                'ltp': close,
+                'volume': np.fromiter(
+                    (candle.get('volume') or 0 for candle in data),
+                    dtype=np.int64, count=len(data)
+                )
+            }
             
-            logger.info(f"Fetched {len(transformed_data)} candles for {symbol}")
+            logger.info(f"Fetched {candle_count(transformed_data)} candles for {symbol}")
             return transformed_data
         
         except Exception as e:
@@ -105,72 +159,254 @@ class HistoricalDataService:
     
     async def replay_historical_data(
         self,
-        data: List[Dict],
+        data: Dict[str, np.ndarray],
         callback: Callable,
         interval: float = 1.0,
-        speed_multiplier: float = 1.0
+        speed_multiplier: float = 1.0,
+        instrument_token: str = "256265",
+        batch_size: int = 1
     ):
         """
         Replay historical data by emitting ticks at specified intervals
         
         Args:
-            data: List of historical candles to replay
+            data: Columnar candles to replay (as returned by fetch_historical_data)
             callback: Async callback function to process each tick
                       Should accept (instrument_token: str, tick_data: Dict or float)
             interval: Base interval between ticks in seconds
             speed_multiplier: Speed multiplier (1.0 = real-time, 2.0 = 2x speed, etc.)
+            instrument_token: Token reported to the callback
+            batch_size: Max due ticks per callback call; above 1 the callback gets a
+                        list of tick dicts (100-1000 suits high-speed simulation)
+        
+        Returns:
+            True if every tick was delivered, False if stopped or failed
         """
-        logger.info(f"replay_historical_data called with {len(data) if data else 0} candles")
+        return await self.replay_merged_historical_data(
+            {instrument_token: data}, callback, interval, speed_multiplier, batch_size
+        )
+    
+    async def replay_merged_historical_data(
+        self,
+        streams: Dict[str, Dict[str, np.ndarray]],
+        callback: Callable,
+        interval: float = 1.0,
+        speed_multiplier: float = 1.0,
+        batch_size: int = 1
+    ):
+        """
+        Replay several instruments as one time-ordered stream from a single task
+        
+        Candles sharing a timestamp are emitted back to back and the clock
+        advances once per distinct timestamp, so N symbols cost one scheduler
+        wakeup per step rather than N.
+        
+        Args:
+            streams: Instrument token -> columnar candles
+            callback: Async callback function to process each tick
+                      Should accept (instrument_token: str, tick_data: Dict or float)
+            interval: Base interval between timestamps in seconds
+            speed_multiplier: Speed multiplier (1.0 = real-time, 2.0 = 2x speed, etc.)
+            batch_size: Max due ticks per callback call; above 1 the callback gets
+                        (instrument_token, [tick_data, ...]) for one instrument
         
-        if not data:
+        Returns:
+            True if every tick was delivered, False if stopped or failed
+        """
+        streams = {token: data for token, data in streams.items() if candle_count(data)}
+        count = sum(candle_count(data) for data in streams.values())
+        logger.info(f"replay_historical_data called with {count} candles")
+        
+        if not count:
             logger.warning("No data to replay")
-            return
+            return True
         
         self.replay_active = True
         actual_interval = interval / speed_multiplier
         
-        logger.info(f"Starting replay of {len(data)} ticks at {actual_interval:.2f}s intervals (speed: {speed_multiplier}x)")
+        logger.info(f"Starting replay of {count} ticks at {actual_interval:.2f}s intervals (speed: {speed_multiplier}x)")
+        
+        tokens = list(streams)
+        if len(tokens) == 1:
+            # A single stream is already time-ordered; use its columns as they are
+            merged = streams[tokens[0]]
+            owner_tokens = [tokens[0]] * count
+        else:
+            # Merge all streams by timestamp (stable, so per-symbol order is kept)
+            owners = np.repeat(np.arange(len(tokens)), [candle_count(streams[token]) for token in tokens])
+            order = np.argsort(
+                np.concatenate([streams[token]['timestamp'] for token in tokens]), kind='stable'
+            )
+            merged = {
+                column: np.concatenate([streams[token][column] for token in tokens])[order]
+                for column in ('timestamp', 'ltp', 'open', 'high', 'low', 'close')
+            }
+            owner_tokens = [tokens[owner] for owner in owners[order].tolist()]
+        
+        raw_timestamps = merged['timestamp']
+        timestamps = pd.DatetimeIndex(raw_timestamps).tz_localize(IST)
+        # A step ends where the next candle carries a later timestamp
+        step_ends = np.append(raw_timestamps[1:] != raw_timestamps[:-1], True).tolist()
+        # Log every 50 ticks AND last 5
+        positions = np.arange(1, count + 1)
+        log_flags = ((positions % 50 == 0) | (positions >= count - 5)).tolist()
+        
+        # Build every (token, tick data with timestamp) pair up front so the
+        # timed loop only enqueues; ltp usually is the close column, converted once
+        closes = merged['close'].tolist()
+        ltps = closes if merged['ltp'] is merged['close'] else merged['ltp'].tolist()
+        ticks_out = [
+            (token, {
+                'last_price': ltp,
+                'timestamp': timestamp,
+                'open': open_,
+                'high': high,
+                'low': low,
+                'close': close
+            })
+            for token, ltp, timestamp, open_, high, low, close in zip(
+                owner_tokens,
+                ltps,
+                timestamps,
+                merged['open'].tolist(),
+                merged['high'].tolist(),
+                merged['low'].tolist(),
+                closes
+            )
+        ]
+        
+        # The callback runs in its own task so strategy latency doesn't stall the replay clock
+        ticks: asyncio.Queue = asyncio.Queue(maxsize=self.REPLAY_QUEUE_SIZE)
+        consumer = asyncio.create_task(self._dispatch_ticks(ticks, callback, batch_size))
+        
+        # Ticks are scheduled against the loop's monotonic clock so sleep overshoot
+        # doesn't accumulate; steps already overdue are sent without sleeping, which
+        # keeps sub-millisecond (very high speed) replays on their target rate
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        completed = False
         
         try:
-            for i, candle in enumerate(data):
+            for i in range(count):
                 if not self.replay_active:
                     logger.info("Replay stopped")
                     break
                 
-                # Extract LTP and timestamp
-                ltp = candle['ltp']
-                timestamp = candle['timestamp']
-                
-                # Create tick data dict with timestamp
-                tick_data = {
-                    'last_price': ltp,
-                    'timestamp': timestamp,
-                    'open': candle.get('open', ltp),
-                    'high': candle.get('high', ltp),
-                    'low': candle.get('low', ltp),
-                    'close': candle.get('close', ltp)
-                }
-                
-                # Call the callback with the tick data including timestamp
-                await callback("256265", tick_data)
+                # Hand the tick data including timestamp to the callback task
+                tick = ticks_out[i]
+                await ticks.put(tick)
                 
-                if (i + 1) % 50 == 0 or (i + 1) >= len(data) - 5:  # Log every 50 ticks AND last 5
-                    logger.info(f"Replayed {i+1}/{len(data)} ticks: LTP={ltp:.2f} at {timestamp}")
+                if log_flags[i]:
+                    tick_data = tick[1]
+                    logger.info(
+                        f"Replayed {i+1}/{count} ticks: LTP={tick_data['last_price']:.2f} "
+                        f"at {tick_data['timestamp']}"
+                    )
                 
-                # Wait for next tick
-                if i < len(data) - 1:
-                    await asyncio.sleep(actual_interval)
+                # Wait for next timestamp
+                if step_ends[i] and i < count - 1:
+                    deadline += actual_interval
+                    delay = deadline - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
             
-            logger.info(f"Replay completed: {len(data)} ticks processed")
-            if len(data) > 0:
-                logger.info(f"Final timestamp: {data[-1]['timestamp']}")
+            if self.replay_active:
+                # Let the callback finish every queued tick before reporting completion
+                await ticks.put(None)
+                await consumer
+                completed = self.replay_active
+                logger.info(f"Replay completed: {count} ticks processed")
+                logger.info(f"Final timestamp: {timestamps[-1]}")
         
         except asyncio.CancelledError:
             logger.info("Replay cancelled")
         except Exception as e:
             logger.error(f"Error during replay: {e}")
         finally:
+            consumer.cancel()
             self.replay_active = False
+        
+        return completed
+    
+    async def replay_cached_range(
+        self,
+        callback: Callable,
+        instrument_token: str,
+        start: datetime,
+        end: datetime,
+        interval: str = "minute",
+        replay_interval: float = 1.0,
+        speed_multiplier: float = 1.0,
+        batch_size: int = 1
+    ) -> bool:
+        """
+        Replay a disk-cached multi-day range one day at a time
+        
+        Each day is mapped, replayed and released before the next is opened,
+        so resident candles and prepared ticks stay bounded by a single day
+        however long the range is.
+        
+        Args:
+            callback: Async callback function to process each tick
+            instrument_token: Instrument token (also reported to the callback)
+            start: Range start (inclusive)
+            end: Range end (inclusive)
+            interval: Candle interval of the cached shards
+            replay_interval: Base interval between ticks in seconds
+            speed_multiplier: Speed multiplier (1.0 = real-time, 2.0 = 2x speed, etc.)
+            batch_size: Max due ticks per callback call (see replay_historical_data)
+        
+        Returns:
+            True if every cached tick was delivered, False if stopped or failed
+        """
+        for day_data in self.iter_cached_range(
+            instrument_token, start, end, interval, columns=self.REPLAY_COLUMNS
+        ):
+            completed = await self.replay_historical_data(
+                data=day_data,
+                callback=callback,
+                interval=replay_interval,
+                speed_multiplier=speed_multiplier,
+                instrument_token=instrument_token,
+                batch_size=batch_size
+            )
+            if not completed:
+                return False
+        return True
+    
+    async def _dispatch_ticks(self, ticks: asyncio.Queue, callback: Callable, batch_size: int = 1):
+        """
+        Feed queued replay ticks to the callback in order
+        
+        With batch_size above 1, consecutive ticks of one instrument that are
+        already queued (i.e. due) go out in a single callback call, so a fast
+        replay pays one callback round trip per batch instead of per tick.
+        """
+        carry = []
+        while True:
+            item = carry.pop() if carry else await ticks.get()
+            if item is None:
+                return
+            if not self.replay_active:
+                # Stopped or failed: discard the backlog so the producer never blocks
+                continue
+            
+            if batch_size > 1:
+                token, tick_data = item
+                batch = [tick_data]
+                while len(batch) < batch_size and not ticks.empty():
+                    queued = ticks.get_nowait()
+                    if queued is None or queued[0] != token:
+                        carry.append(queued)
+                        break
+                    batch.append(queued[1])
+                item = (token, batch)
+            
+            try:
+                await callback(*item)
+            except Exception as e:
+                logger.error(f"Error during replay: {e}")
+                self.replay_active = False
     
     def stop_replay(self):
         """
@@ -183,6 +419,166 @@ class HistoricalDataService:
             if self.replay_task and not self.replay_task.done():
                 self.replay_task.cancel()
     
+    def _cache_path(self, instrument_token: str, day: date, interval: str) -> Path:
+        # Partitioned by instrument, one shard per day
+        return self.CACHE_DIR / str(instrument_token) / f"{day.isoformat()}_{interval}.npy"
+    
+    def _load_cached_day(
+        self,
+        path: Path,
+        columns: Optional[Tuple[str, ...]] = None
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Load a persisted candle set, or None if missing/unreadable
+        
+        The shard is memory-mapped, so columns are zero-copy views that the
+        OS pages in on first touch; nothing is parsed or decompressed.
+        
+        Args:
+            path: Shard path
+            columns: Columns to expose (default: all)
+        """
+        try:
+            cached = np.load(path, mmap_mode='r')
+            names = cached.dtype.names
+            if columns is not None:
+                names = [name for name in names if name in columns]
+            data = {name: cached[name] for name in names}
+            # ltp is the close column
+            if 'close' in data:
+                data['ltp'] = data['close']
+            return data
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable historical cache {path}: {e}")
+            # Drop it so the next fetch can write a fresh shard in its place
+            path.unlink(missing_ok=True)
+            return None
+    
+    def iter_cached_range(
+        self,
+        instrument_token: str,
+        start: datetime,
+        end: datetime,
+        interval: str = "minute",
+        columns: Optional[Tuple[str, ...]] = None
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Yield disk-cached candles between two IST wall-clock times, one day at a time
+        
+        Only shards for days inside the range are opened, each lazily as the
+        caller advances, and the edge days are trimmed by binary search on
+        their timestamps. Days without a shard are simply skipped.
+        
+        Args:
+            instrument_token: Instrument token
+            start: Range start (inclusive)
+            end: Range end (inclusive)
+            interval: Candle interval
+            columns: Columns to load (default: all)
+        
+        Yields:
+            Columnar candles for each cached day in the range
+        """
+        if columns is not None and 'timestamp' not in columns:
+            columns = ('timestamp', *columns)
+        if start.tzinfo is not None:
+            start = start.astimezone(IST).replace(tzinfo=None)
+        if end.tzinfo is not None:
+            end = end.astimezone(IST).replace(tzinfo=None)
+        lower = np.datetime64(start, 'ns')
+        upper = np.datetime64(end, 'ns')
+        
+        for day in pd.date_range(start.date(), end.date(), freq='D').date:
+            shard = self._load_cached_day(self._cache_path(instrument_token, day, interval), columns)
+            if not shard:
+                continue
+            timestamps = shard['timestamp']
+            first = np.searchsorted(timestamps, lower, side='left')
+            last = np.searchsorted(timestamps, upper, side='right')
+            if first < last:
+                yield {name: column[first:last] for name, column in shard.items()}
+    
+    def load_cached_range(
+        self,
+        instrument_token: str,
+        start: datetime,
+        end: datetime,
+        interval: str = "minute",
+        columns: Optional[Tuple[str, ...]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Load disk-cached candles between two IST wall-clock times as one candle set
+        
+        Args:
+            instrument_token: Instrument token
+            start: Range start (inclusive)
+            end: Range end (inclusive)
+            interval: Candle interval
+            columns: Columns to load (default: all)
+        
+        Returns:
+            Columnar candles for the cached part of the range; empty dict if none
+        """
+        shards = list(self.iter_cached_range(instrument_token, start, end, interval, columns))
+        if not shards:
+            return {}
+        data = {
+            name: np.concatenate([shard[name] for shard in shards])
+            for name in shards[0] if name != 'ltp'
+        }
+        if 'close' in data:
+            data['ltp'] = data['close']
+        return data
+    
+    def _save_cached_day(self, path: Path, data: Dict[str, np.ndarray]):
+        """Persist a candle set atomically"""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Per-process temp name so concurrent writers of the same day don't collide
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            # One bulk write of the distinct columns; ltp aliases close and is restored on load
+            records = np.empty(candle_count(data), dtype=self.SHARD_DTYPE)
+            for name in self.SHARD_DTYPE.names:
+                records[name] = data[name]
+            with open(tmp_path, 'wb') as f:
+                np.save(f, records)
+            os.replace(tmp_path, path)
+            # Drop the shard this replaces from the older .npz cache format
+            path.with_suffix('.npz').unlink(missing_ok=True)
+        except Exception as e:
+            logger.warning(f"Failed to persist historical cache {path}: {e}")
+    
+    def _save_cached_days(self, instrument_token: str, interval: str, data: Dict[str, np.ndarray]):
+        """
+        Persist candles as one shard per completed trading day
+        
+        Multi-day fetches are written day by day, so each write stays bounded
+        by a single session's candles and every day is reusable on its own.
+        A completed session never changes, so days that already have a shard
+        are left as they are instead of being rewritten.
+        
+        Args:
+            instrument_token: Instrument token the candles belong to
+            interval: Candle interval
+            data: Columnar candles, timestamp-ordered
+        """
+        days = data['timestamp'].astype('datetime64[D]')
+        today = np.datetime64(datetime.now(IST).date())
+        bounds = np.flatnonzero(days[1:] != days[:-1]) + 1
+        
+        for start, end in zip(np.r_[0, bounds].tolist(), np.r_[bounds, len(days)].tolist()):
+            day = days[start]
+            if day >= today:
+                # The current session is still forming
+                continue
+            path = self._cache_path(instrument_token, day.item(), interval)
+            if path.exists():
+                continue
+            shard = {name: column[start:end] for name, column in data.items()}
+            self._save_cached_day(path, shard)
+    
     def get_recent_trading_day(self, days_back: int = 1) -> datetime:
         """
         Get a recent trading day for fetching historical data
@@ -193,24 +589,18 @@ class HistoricalDataService:
         Returns:
             datetime: A recent trading day
         """
-        from backend.services.market_calendar import is_trading_day
-        
         now = datetime.now(IST)
-        target_date = now - timedelta(days=days_back)
-        
-        # Find previous trading day
-        while not is_trading_day(target_date):
-            target_date = target_date - timedelta(days=1)
-        
-        return target_date
+        today = now.date()
+        return now - (today - _recent_trading_day(today, days_back))
     
     def prepare_simulation_data(
         self,
         symbol: str = "NIFTY 50",
         instrument_token: str = "256265",
         days_back: int = 1,
-        interval: str = "minute"
-    ) -> List[Dict]:
+        interval: str = "minute",
+        columns: Optional[Tuple[str, ...]] = None
+    ) -> Dict[str, np.ndarray]:
         """
         Prepare data for simulation by fetching a recent trading day
         
@@ -219,9 +609,10 @@ class HistoricalDataService:
             instrument_token: Instrument token
             days_back: Number of days back to fetch (default: 1 = yesterday)
             interval: Data interval
+            columns: Columns needed from a disk-cached day (default: all)
         
         Returns:
-            List of candles ready for replay
+            Columnar candles ready for replay
         """
         try:
             # Get a recent trading day
@@ -233,27 +624,36 @@ class HistoricalDataService:
             
             logger.info(f"Preparing simulation data for {target_date.date()}")
             
-            # Fetch historical data
-            data = self.fetch_historical_data(
-                symbol=symbol,
-                instrument_token=instrument_token,
-                start_date=start_time,
-                end_date=end_time,
-                interval=interval
-            )
+            # Reuse a completed day from disk instead of spending broker rate limit
+            completed_day = target_date.date() < datetime.now(IST).date()
+            cache_path = self._cache_path(instrument_token, target_date.date(), interval)
+            data = self._load_cached_day(cache_path, columns) if completed_day else None
+            
+            if data:
+                logger.info(f"Loaded simulation data for {target_date.date()} from disk cache")
+            else:
+                # Fetch historical data
+                data = self.fetch_historical_data(
+                    symbol=symbol,
+                    instrument_token=instrument_token,
+                    start_date=start_time,
+                    end_date=end_time,
+                    interval=interval
+                )
+                if data and completed_day:
+                    self._save_cached_days(instrument_token, interval, data)
             
             if not data:
                 logger.warning(f"No data available for {target_date.date()}")
-                return []
+                return {}
             
-            logger.info(f"Prepared {len(data)} candles for simulation")
-            if len(data) > 0:
-                logger.info(f"Data range: {data[0]['timestamp']} to {data[-1]['timestamp']}")
+            logger.info(f"Prepared {candle_count(data)} candles for simulation")
+            logger.info(f"Data range: {data['timestamp'][0]} to {data['timestamp'][-1]}")
             return data
         
         except Exception as e:
             logger.error(f"Error preparing simulation data: {e}")
-            return []
+            return {}
     
     async def start_replay_simulation(
         self,
@@ -281,7 +681,8 @@ class HistoricalDataService:
                 symbol=symbol,
                 instrument_token=instrument_token,
                 days_back=days_back,
-                interval=interval
+                interval=interval,
+                columns=self.REPLAY_COLUMNS
             )
             
             if not data:
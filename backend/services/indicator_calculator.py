@@ -1,10 +1,15 @@
 """Technical indicator calculations using Numba for performance"""
 import numpy as np
-from numba import njit
-from typing import Tuple
+from numba import njit, prange
+from typing import Dict, List, Sequence, Tuple
+from backend.config import settings
 
+# float32 is ample for 5-6 significant digit prices and halves the memory the
+# kernels stream through; their running sums still accumulate in float64
+PRICE_DTYPE = np.float64 if settings.INDICATOR_FLOAT64 else np.float32
 
-@njit
+
+@njit(cache=True)
 def calculate_sma(prices: np.ndarray, period: int) -> np.ndarray:
     """
     Calculate Simple Moving Average using Numba JIT compilation
@@ -17,16 +22,43 @@ def calculate_sma(prices: np.ndarray, period: int) -> np.ndarray:
         Array of SMA values
     """
     n = len(prices)
-    sma = np.empty(n)
+    sma = np.empty_like(prices)
     sma[:period-1] = np.nan
+    if n < period:
+        return sma
+    
+    # Running window sum: one add and one subtract per bar instead of a mean per window
+    window_sum = 0.0
+    for i in range(period):
+        window_sum += prices[i]
+    sma[period-1] = window_sum / period
     
-    for i in range(period-1, n):
-        sma[i] = np.mean(prices[i-period+1:i+1])
+    for i in range(period, n):
+        window_sum += prices[i] - prices[i-period]
+        sma[i] = window_sum / period
     
     return sma
 
 
-@njit
+@njit(parallel=True, cache=True)
+def calculate_sma_batch(prices: np.ndarray, period: int) -> np.ndarray:
+    """
+    Calculate SMAs for many symbols at once, one row per symbol, in parallel
+    
+    Args:
+        prices: 2-D array of prices, shape (symbols, bars)
+        period: Period for moving average
+        
+    Returns:
+        2-D array of SMA values, same shape as prices
+    """
+    out = np.empty_like(prices)
+    for s in prange(prices.shape[0]):
+        out[s] = calculate_sma(prices[s], period)
+    return out
+
+
+@njit(cache=True)
 def calculate_bollinger_bands(prices: np.ndarray, period: int = 20, std_dev: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     Calculate Bollinger Bands using Numba JIT compilation
@@ -40,27 +72,42 @@ def calculate_bollinger_bands(prices: np.ndarray, period: int = 20, std_dev: flo
         Tuple of (upper_band, middle_band, lower_band)
     """
     n = len(prices)
-    middle = np.empty(n)
-    upper = np.empty(n)
-    lower = np.empty(n)
+    middle = np.empty_like(prices)
+    upper = np.empty_like(prices)
+    lower = np.empty_like(prices)
     
     middle[:period-1] = np.nan
     upper[:period-1] = np.nan
     lower[:period-1] = np.nan
+    if n < period:
+        return upper, middle, lower
     
-    for i in range(period-1, n):
-        window = prices[i-period+1:i+1]
-        mean = np.mean(window)
-        std = np.std(window)
-        
-        middle[i] = mean
-        upper[i] = mean + (std_dev * std)
-        lower[i] = mean - (std_dev * std)
+    # Rolling sums of x and x^2 give mean and population variance in O(1) per bar.
+    # Prices are shifted by the first one so the squares stay small and
+    # E[x^2] - E[x]^2 doesn't cancel catastrophically at index-level prices.
+    shift = float(prices[0])
+    sum1 = 0.0
+    sum2 = 0.0
+    for i in range(n):
+        x = float(prices[i]) - shift
+        sum1 += x
+        sum2 += x * x
+        if i >= period:
+            old = float(prices[i-period]) - shift
+            sum1 -= old
+            sum2 -= old * old
+        if i >= period - 1:
+            mean = sum1 / period
+            std = np.sqrt(max(sum2 / period - mean * mean, 0.0))
+            
+            middle[i] = mean + shift
+            upper[i] = middle[i] + (std_dev * std)
+            lower[i] = middle[i] - (std_dev * std)
     
     return upper, middle, lower
 
 
-@njit
+@njit(cache=True)
 def detect_crossover(series1: np.ndarray, series2: np.ndarray) -> np.ndarray:
     """
     Detect when series1 crosses above series2
@@ -83,7 +130,7 @@ def detect_crossover(series1: np.ndarray, series2: np.ndarray) -> np.ndarray:
     return crossover
 
 
-@njit
+@njit(cache=True)
 def detect_crossunder(series1: np.ndarray, series2: np.ndarray) -> np.ndarray:
     """
     Detect when series1 crosses below series2
@@ -106,7 +153,109 @@ def detect_crossunder(series1: np.ndarray, series2: np.ndarray) -> np.ndarray:
     return crossunder
 
 
-@njit
+@njit(cache=True)
+def last_sma(prices: np.ndarray, period: int) -> float:
+    """
+    Calculate the SMA of the last bar only
+    
+    Args:
+        prices: Array of prices
+        period: Period for moving average
+        
+    Returns:
+        SMA at the last bar, or NaN if there are fewer than period prices
+    """
+    n = len(prices)
+    if n < period:
+        return np.nan
+    
+    window_sum = 0.0
+    for i in range(n - period, n):
+        window_sum += prices[i]
+    return window_sum / period
+
+
+@njit(cache=True)
+def last_bollinger_cross(prices: np.ndarray, period: int = 20, std_dev: float = 2.0) -> Tuple[bool, bool]:
+    """
+    Detect whether the last bar crossed under the lower / over the upper band
+    
+    Fuses calculate_bollinger_bands with detect_crossunder/detect_crossover
+    for the only bar callers read, touching just the last period + 1 prices.
+    
+    Args:
+        prices: Array of prices
+        period: Period for moving average
+        std_dev: Number of standard deviations
+        
+    Returns:
+        Tuple of (crossunder_lower, crossover_upper) at the last bar
+    """
+    n = len(prices)
+    if n < period + 1 or np.isnan(prices[n - 1]):
+        return False, False
+    
+    # Sums over the shared part of both windows, shifted by the last price so
+    # that price itself is 0 (same conditioning as calculate_bollinger_bands)
+    shift = float(prices[n - 1])
+    sum1 = 0.0
+    sum2 = 0.0
+    for i in range(n - period, n - 1):
+        x = float(prices[i]) - shift
+        sum1 += x
+        sum2 += x * x
+    
+    first = float(prices[n - period - 1]) - shift
+    mean_prev = (sum1 + first) / period
+    std_prev = np.sqrt(max((sum2 + first * first) / period - mean_prev * mean_prev, 0.0))
+    mean_curr = sum1 / period
+    std_curr = np.sqrt(max(sum2 / period - mean_curr * mean_curr, 0.0))
+    
+    prev = float(prices[n - 2]) - shift
+    curr = 0.0
+    
+    crossunder = prev >= mean_prev - std_dev * std_prev and curr < mean_curr - std_dev * std_curr
+    crossover = prev <= mean_prev + std_dev * std_prev and curr > mean_curr + std_dev * std_curr
+    return crossunder, crossover
+
+
+@njit(cache=True)
+def last_sma_cross(prices: np.ndarray, period: int) -> Tuple[bool, bool]:
+    """
+    Detect whether the last bar crossed under/over its SMA
+    
+    Fuses calculate_sma with detect_crossunder/detect_crossover for the
+    only bar callers read, touching just the last period + 1 prices.
+    
+    Args:
+        prices: Array of prices
+        period: Period for moving average
+        
+    Returns:
+        Tuple of (crossunder, crossover) at the last bar
+    """
+    n = len(prices)
+    if n < period + 1:
+        return False, False
+    
+    # The two windows share all but one price at each end
+    shared = 0.0
+    for i in range(n - period, n - 1):
+        shared += prices[i]
+    ma_prev = (shared + prices[n - period - 1]) / period
+    ma_curr = (shared + prices[n - 1]) / period
+    
+    prev = prices[n - 2]
+    curr = prices[n - 1]
+    if np.isnan(curr) or np.isnan(ma_curr):
+        return False, False
+    
+    crossunder = prev >= ma_prev and curr < ma_curr
+    crossover = prev <= ma_prev and curr > ma_curr
+    return crossunder, crossover
+
+
+@njit(cache=True)
 def calculate_rsi(prices: np.ndarray, period: int = 14) -> np.ndarray:
     """
     Calculate Relative Strength Index
@@ -119,54 +268,93 @@ def calculate_rsi(prices: np.ndarray, period: int = 14) -> np.ndarray:
         Array of RSI values
     """
     n = len(prices)
-    rsi = np.empty(n)
+    rsi = np.empty_like(prices)
     rsi[:period] = np.nan
+    if n <= period:
+        return rsi
     
-    # Calculate price changes
-    deltas = np.diff(prices)
-    
-    # Separate gains and losses
-    gains = np.where(deltas > 0, deltas, 0)
-    losses = np.where(deltas < 0, -deltas, 0)
-    
-    # Calculate initial average gain and loss
-    avg_gain = np.mean(gains[:period])
-    avg_loss = np.mean(losses[:period])
-    
-    if avg_loss == 0:
-        rsi[period] = 100
-    else:
-        rs = avg_gain / avg_loss
-        rsi[period] = 100 - (100 / (1 + rs))
-    
-    # Calculate subsequent RSI values
-    for i in range(period + 1, n):
-        avg_gain = (avg_gain * (period - 1) + gains[i - 1]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i - 1]) / period
+    # Price changes are split into gain/loss on the fly; no diff/where temporaries
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n):
+        delta = prices[i] - prices[i - 1]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
         
-        if avg_loss == 0:
-            rsi[i] = 100
+        if i <= period:
+            # Calculate initial average gain and loss
+            avg_gain += gain
+            avg_loss += loss
+            if i < period:
+                continue
+            avg_gain /= period
+            avg_loss /= period
         else:
-            rs = avg_gain / avg_loss
-            rsi[i] = 100 - (100 / (1 + rs))
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+        
+        # 100 - 100 / (1 + gain/loss) == 100 * gain / (gain + loss): one division,
+        # and a zero loss saturates to 100 without a special case. Only a flat
+        # window (no gain, no loss) needs the select, which keeps its RSI at 100.
+        total = avg_gain + avg_loss
+        rsi[i] = 100.0 * avg_gain / total if total > 0 else 100.0
     
     return rsi
 
 
 class IndicatorCalculator:
-    """Main class for calculating technical indicators"""
+    """
+    Main class for calculating technical indicators
+    
+    The static methods work on any price sequence. An instance additionally
+    keeps a bounded tick history: push() is O(1) and prices is a contiguous
+    PRICE_DTYPE view that the static methods consume without copying.
+    """
+    
+    MAX_HISTORY = 5000
+    
+    def __init__(self, max_history: int = MAX_HISTORY):
+        self._capacity = max_history
+        # Every price is written twice, capacity apart, so the newest `count`
+        # prices are always one contiguous slice
+        self._buf = np.empty(2 * max_history, dtype=PRICE_DTYPE)
+        self._next = 0
+        self._count = 0
+    
+    def push(self, price: float):
+        """Append a tick, dropping the oldest once MAX_HISTORY is reached"""
+        i = self._next
+        self._buf[i] = price
+        self._buf[i + self._capacity] = price
+        self._next = (i + 1) % self._capacity
+        if self._count < self._capacity:
+            self._count += 1
+    
+    @property
+    def prices(self) -> np.ndarray:
+        """Oldest-to-newest PRICE_DTYPE history (a view; valid until the next push)"""
+        start = (self._next - self._count) % self._capacity
+        return self._buf[start:start + self._count]
+    
+    def __len__(self) -> int:
+        return self._count
     
     @staticmethod
-    def calculate_ma(prices: list, period: int) -> list:
+    def calculate_ma(prices: Sequence[float], period: int) -> List[float]:
         """Calculate Moving Average"""
-        prices_array = np.array(prices, dtype=np.float64)
-        ma = calculate_sma(prices_array, period)
-        return ma.tolist()
+        prices_array = np.asarray(prices, dtype=PRICE_DTYPE)
+        return calculate_sma(prices_array, period).tolist()
     
     @staticmethod
-    def calculate_bollinger(prices: list, period: int = 20, std_dev: float = 2.0) -> dict:
+    def calculate_ma_batch(prices: np.ndarray, period: int) -> np.ndarray:
+        """Calculate Moving Averages for a (symbols, bars) price matrix across cores"""
+        prices_array = np.ascontiguousarray(prices, dtype=PRICE_DTYPE)
+        return calculate_sma_batch(prices_array, period)
+    
+    @staticmethod
+    def calculate_bollinger(prices: Sequence[float], period: int = 20, std_dev: float = 2.0) -> Dict[str, List[float]]:
         """Calculate Bollinger Bands"""
-        prices_array = np.array(prices, dtype=np.float64)
+        prices_array = np.asarray(prices, dtype=PRICE_DTYPE)
         upper, middle, lower = calculate_bollinger_bands(prices_array, period, std_dev)
         return {
             "upper": upper.tolist(),
@@ -175,7 +363,7 @@ class IndicatorCalculator:
         }
     
     @staticmethod
-    def check_trend(prices: list, ma_short_period: int, ma_long_period: int) -> str:
+    def check_trend(prices: Sequence[float], ma_short_period: int, ma_long_period: int) -> str:
         """
         Check if trend is uptrend or downtrend
         
@@ -185,13 +373,11 @@ class IndicatorCalculator:
         if len(prices) < max(ma_short_period, ma_long_period):
             return "neutral"
         
-        prices_array = np.array(prices, dtype=np.float64)
-        ma_short = calculate_sma(prices_array, ma_short_period)
-        ma_long = calculate_sma(prices_array, ma_long_period)
+        prices_array = np.asarray(prices, dtype=PRICE_DTYPE)
         
-        # Get the latest values
-        latest_short = ma_short[-1]
-        latest_long = ma_long[-1]
+        # Only the latest values are needed
+        latest_short = last_sma(prices_array, ma_short_period)
+        latest_long = last_sma(prices_array, ma_long_period)
         
         if np.isnan(latest_short) or np.isnan(latest_long):
             return "neutral"
@@ -199,7 +385,7 @@ class IndicatorCalculator:
         return "uptrend" if latest_short > latest_long else "downtrend"
     
     @staticmethod
-    def check_ltp_cross_ma(prices: list, ma_period: int) -> dict:
+    def check_ltp_cross_ma(prices: Sequence[float], ma_period: int) -> dict:
         """
         Check if LTP crossed below MA (buy signal for uptrend strategy)
         
@@ -209,19 +395,16 @@ class IndicatorCalculator:
         if len(prices) < ma_period + 1:
             return {"crossunder": False, "crossover": False}
         
-        prices_array = np.array(prices, dtype=np.float64)
-        ma = calculate_sma(prices_array, ma_period)
-        
-        crossunder = detect_crossunder(prices_array, ma)
-        crossover = detect_crossover(prices_array, ma)
+        prices_array = np.asarray(prices, dtype=PRICE_DTYPE)
+        crossunder, crossover = last_sma_cross(prices_array, ma_period)
         
         return {
-            "crossunder": bool(crossunder[-1]),
-            "crossover": bool(crossover[-1])
+            "crossunder": bool(crossunder),
+            "crossover": bool(crossover)
         }
     
     @staticmethod
-    def check_ltp_cross_bollinger(prices: list, period: int = 20, std_dev: float = 2.0) -> dict:
+    def check_ltp_cross_bollinger(prices: Sequence[float], period: int = 20, std_dev: float = 2.0) -> dict:
         """
         Check if LTP crossed below Lower Bollinger Band
         
@@ -231,13 +414,10 @@ class IndicatorCalculator:
         if len(prices) < period + 1:
             return {"crossunder_lbb": False, "crossover_ubb": False}
         
-        prices_array = np.array(prices, dtype=np.float64)
-        upper, middle, lower = calculate_bollinger_bands(prices_array, period, std_dev)
-        
-        crossunder_lbb = detect_crossunder(prices_array, lower)
-        crossover_ubb = detect_crossover(prices_array, upper)
+        prices_array = np.asarray(prices, dtype=PRICE_DTYPE)
+        crossunder_lbb, crossover_ubb = last_bollinger_cross(prices_array, period, std_dev)
         
         return {
-            "crossunder_lbb": bool(crossunder_lbb[-1]),
-            "crossover_ubb": bool(crossover_ubb[-1])
+            "crossunder_lbb": bool(crossunder_lbb),
+            "crossover_ubb": bool(crossover_ubb)
         }
@@ -23,12 +23,11 @@ Performance:
 
 """
 import logging
+import math
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 import pytz
 import asyncio
-from collections import deque
-import json
 import numpy as np
 
 # Import new JSON-based configuration system
@@ -42,6 +41,7 @@ from backend.core.calculations import (
     calculate_bracket_prices,
     calculate_trade_quantity,
     detect_crossover_signals,
+    _detect_crossovers_kernel,
     calculate_moving_averages,
     calculate_bollinger_bands,
     calculate_pnl,
@@ -58,6 +58,7 @@ from backend.services.trading_logic_service import TradingLogicService
 logger = logging.getLogger(__name__)
 
 IST = pytz.timezone('Asia/Kolkata')
+NIFTY_TOKEN = "256265"  # NIFTY 50 index, as delivered in LTP ticks
 
 
 class LiveTradingEngineV2:
@@ -71,6 +72,17 @@ class LiveTradingEngineV2:
     - Broker API as single source of truth
     """
 
+    PRICE_BUFFER_SIZE = 500
+    # Seconds between batched target/SL reconciliation polls (ticks are the fast path)
+    POSITION_RECONCILE_INTERVAL = 5
+    # Trigger names in _detect_crossovers_kernel flag order
+    CROSSOVER_TRIGGERS = ('7ma', '20ma', 'lbb', 'ubb')
+    MINUTES_PER_CANDLE = {
+        "minute": 1, "3minute": 3, "5minute": 5, "10minute": 10,
+        "15minute": 15, "30minute": 30, "60minute": 60, "day": 375
+    }
+    TRADING_MINUTES_PER_DAY = 375  # 6.25 hours
+
     def __init__(self, middleware: UnifiedBrokerMiddleware):
         """
         Initialize HFT trading engine with JSON configuration.
@@ -94,15 +106,25 @@ class LiveTradingEngineV2:
 
         # Real-time indicator tracking (for LTP-based crossover detection)
         self.current_indicators: Dict = {}
-        self.price_buffer: deque = deque(maxlen=500)  # Rolling price buffer for indicators
+        # Rolling price buffer for indicators: each price is written at head and
+        # head + PRICE_BUFFER_SIZE, so the logical window is always one contiguous slice
+        self._price_buf = np.empty(2 * self.PRICE_BUFFER_SIZE, dtype=np.float64)
+        self._price_head = 0
+        self._price_count = 0
+        # Running window sums (of price - _sum_shift) for O(1) indicator updates
+        self._sum_shift = 0.0
+        self._sum_short = 0.0
+        self._sum_long = 0.0
+        self._sum_bb = 0.0
+        self._sumsq_bb = 0.0
 
         # Fund management (JSON-based)
         self.available_funds = 0.0
         self.allocated_funds = 0.0
 
-        # Live data buffers (using deque for efficient FIFO operations)
-        self.major_candles = deque(maxlen=100)  # Last 100 major timeframe candles
-        self.minor_candles = deque(maxlen=500)  # Last 500 minor timeframe candles
+        # Historical candles as columnar arrays (timestamps are naive IST)
+        self.major_ts, self.major_high, self.major_low, self.major_close = self._candle_columns([])  # Last 100
+        self.minor_ts, self.minor_high, self.minor_low, self.minor_close = self._candle_columns([])  # Last 500
 
         # Current market data
         self.nifty_ltp = 0.0
@@ -115,10 +137,23 @@ class LiveTradingEngineV2:
         self.major_trend_changed_at = None
         self.minor_trend = None
         self.minor_trend_changed_at = None
+        self._trends: Tuple[str, str] = ('neutral', 'neutral')  # (major, minor) for signal decisions
+
+        # Position reconciliation task
+        self.position_monitor_task: Optional[asyncio.Task] = None
 
         # Active positions tracking (in-memory, replaces database)
         self.active_positions: Dict[str, Position] = {}  # key: f"{option_type}_{trigger}"
 
+        # Open positions by instrument token, for routing position LTP ticks
+        self._token_to_position: Dict[str, Position] = {}
+
+        # Parallel arrays over active_positions for vectorized target/SL checks
+        self._pos_positions: List[Position] = []
+        self._pos_ltp_keys: List[str] = []
+        self._pos_target = np.empty(0)
+        self._pos_sl = np.empty(0)
+
         # Bracket order cache for LIMIT orders (BUY->SELL sequence)
         self.pending_sell_orders: Dict[str, Dict] = {}  # buy_order_id -> sell_order_details
 
@@ -128,9 +163,6 @@ class LiveTradingEngineV2:
         # Last check time for square off
         self.last_check_time = None
 
-        # Position monitoring task
-        self.position_monitor_task: Optional[asyncio.Task] = None
-
         # Auto-subscription tracking for webhook
         self.subscribed_instruments: set = set()  # Track all subscribed instrument tokens
 
@@ -227,7 +259,7 @@ class LiveTradingEngineV2:
         # Fetch initial historical data for indicators
         await self._fetch_initial_data()
 
-        # Start position monitoring task
+        # Start position reconciliation task (covers positions without live ticks)
         self.position_monitor_task = asyncio.create_task(self._monitor_positions())
 
         # Auto-subscribe to instruments for webhook
@@ -244,7 +276,7 @@ class LiveTradingEngineV2:
 
         self.running = False
 
-        # Cancel position monitoring task
+        # Cancel position reconciliation task
         if self.position_monitor_task and not self.position_monitor_task.done():
             self.position_monitor_task.cancel()
             try:
@@ -295,10 +327,12 @@ class LiveTradingEngineV2:
 
             logger.info("📊 Fetching initial historical data for indicators...")
 
+            # One clock read for both windows, so they share the same end
+            to_date = datetime.now(IST)
+
             # Fetch major timeframe data
             major_days = self._get_days_for_candles(self.config.major_timeframe, 100)
-            from_date = datetime.now(IST) - timedelta(days=major_days)
-            to_date = datetime.now(IST)
+            from_date = to_date - timedelta(days=major_days)
 
             logger.info(f"📈 Fetching NIFTY 50 data from {from_date.date()} to {to_date.date()} ({self.config.major_timeframe})")
 
@@ -312,12 +346,13 @@ class LiveTradingEngineV2:
             )
 
             if major_data_raw:
-                self.major_candles.extend(major_data_raw[-100:])
-                logger.info(f"✅ Loaded {len(self.major_candles)} major timeframe candles")
+                (self.major_ts, self.major_high,
+                 self.major_low, self.major_close) = self._candle_columns(major_data_raw[-100:])
+                logger.info(f"✅ Loaded {len(self.major_close)} major timeframe candles")
 
             # Fetch minor timeframe data
             minor_days = self._get_days_for_candles(self.config.minor_timeframe, 500)
-            from_date = datetime.now(IST) - timedelta(days=minor_days)
+            from_date = to_date - timedelta(days=minor_days)
 
             logger.info(f"📉 Fetching NIFTY 50 data from {from_date.date()} to {to_date.date()} ({self.config.minor_timeframe})")
 
@@ -331,31 +366,75 @@ class LiveTradingEngineV2:
             )
 
             if minor_data_raw:
-                self.minor_candles.extend(minor_data_raw[-500:])
-                logger.info(f"✅ Loaded {len(self.minor_candles)} minor timeframe candles")
+                (self.minor_ts, self.minor_high,
+                 self.minor_low, self.minor_close) = self._candle_columns(minor_data_raw[-500:])
+                logger.info(f"✅ Loaded {len(self.minor_close)} minor timeframe candles")
 
             logger.info("✅ Initial data fetch complete")
 
         except Exception as e:
             logger.error(f"❌ Error fetching initial data: {e}")
 
+    @staticmethod
+    def _candle_columns(candles: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Transpose broker candle dicts into columnar arrays.
+
+        Args:
+            candles: Candle dicts with keys: date, high, low, close
+
+        Returns:
+            Tuple of (timestamps as naive IST datetime64, highs, lows, closes)
+        """
+        n = len(candles)
+        ts = np.array(
+            [c['date'].astimezone(IST).replace(tzinfo=None) if c['date'].tzinfo else c['date']
+             for c in candles],
+            dtype='datetime64[ns]'
+        )
+        high = np.fromiter((c['high'] for c in candles), dtype=np.float64, count=n)
+        low = np.fromiter((c['low'] for c in candles), dtype=np.float64, count=n)
+        close = np.fromiter((c['close'] for c in candles), dtype=np.float64, count=n)
+        return ts, high, low, close
+
     def _get_days_for_candles(self, timeframe: str, num_candles: int) -> int:
         """Calculate number of days needed to fetch required candles."""
-        minutes_per_candle = {
-            "minute": 1, "3minute": 3, "5minute": 5, "10minute": 10,
-            "15minute": 15, "30minute": 30, "60minute": 60, "day": 375
-        }
-
-        minutes = minutes_per_candle.get(timeframe, 1)
-        trading_minutes_per_day = 375  # 6.25 hours
-        days_needed = (num_candles * minutes) / trading_minutes_per_day
+        minutes = self.MINUTES_PER_CANDLE.get(timeframe, 1)
+        days_needed = (num_candles * minutes) / self.TRADING_MINUTES_PER_DAY
 
         # Add buffer for weekends and holidays
-        return int(days_needed * 2) + 5
+        return math.ceil(days_needed * 2) + 5
+
+    def _rebuild_position_arrays(self):
+        """Regenerate the position arrays; call after every active_positions change."""
+        positions = list(self.active_positions.values())
+        self._pos_positions = positions
+        self._pos_ltp_keys = [p.ltp_key for p in positions]
+        # Unset levels become NaN, which never compares as hit
+        self._pos_target = np.array([p.target_price or np.nan for p in positions], dtype=np.float64)
+        self._pos_sl = np.array([p.stoploss_price or np.nan for p in positions], dtype=np.float64)
+
+    def _fetch_position_ltps(self, positions: Sequence[Position]) -> Dict[str, float]:
+        """
+        Fetch LTPs for several positions with a single broker call.
+
+        Args:
+            positions: Positions to price
+
+        Returns:
+            Dict mapping "NFO:<symbol>" to LTP (empty on failure)
+        """
+        return self.middleware.get_ltp([p.ltp_key for p in positions]) or {}
 
     async def _monitor_positions(self):
-        """Background task to monitor open positions."""
-        logger.info("👀 Position monitoring task started")
+        """
+        Background task that reconciles open positions against batched LTPs.
+
+        Ticks routed through _token_to_position check targets immediately;
+        this poll is the safety net for positions whose subscription failed
+        or whose ticks stopped arriving.
+        """
+        logger.info("👀 Position reconciliation task started")
 
         try:
             while self.running:
@@ -365,33 +444,42 @@ class LiveTradingEngineV2:
                     await asyncio.sleep(60)
                     continue
 
-                # Monitor each position
-                for key, position in list(self.active_positions.items()):
-                    await self._check_position_targets(position)
+                # Fetch LTPs for all positions in one broker call
+                positions = self._pos_positions
+                if positions:
+                    ltp_map = self._fetch_position_ltps(positions)
+                    # Missing or non-positive quotes become NaN, which never compares as hit
+                    ltps = np.fromiter(
+                        (ltp_map.get(key, np.nan) for key in self._pos_ltp_keys),
+                        dtype=np.float64, count=len(positions)
+                    )
+                    ltps[~(ltps > 0)] = np.nan
+
+                    # Only positions at target or stoploss go through exit logic
+                    hits = np.flatnonzero((ltps >= self._pos_target) | (ltps <= self._pos_sl))
+                    for i in hits:
+                        await self._check_position_targets(positions[i], float(ltps[i]))
 
-                # Wait before next check (every 5 seconds)
-                await asyncio.sleep(5)
+                await asyncio.sleep(self.POSITION_RECONCILE_INTERVAL)
 
         except asyncio.CancelledError:
-            logger.info("🛑 Position monitoring task cancelled")
+            logger.info("🛑 Position reconciliation task cancelled")
         except Exception as e:
-            logger.error(f"❌ Error in position monitoring: {e}")
+            logger.error(f"❌ Error in position reconciliation: {e}")
 
-    async def _check_position_targets(self, position: Position):
+    async def _check_position_targets(self, position: Position, ltp: float):
         """
         Check if position has hit target or stoploss.
 
         Args:
             position: Position object to check
+            ltp: Current LTP of the position's contract
         """
         try:
             # Skip if position is not open
             if position.status != 'open':
                 return
 
-            # Get current LTP from middleware
-            ltp_data = self.middleware.get_ltp([f"NFO:{position.symbol}"])
-            ltp = ltp_data.get(f"NFO:{position.symbol}", 0) if ltp_data else 0
             if not ltp or ltp <= 0:
                 return
 
@@ -404,7 +492,7 @@ class LiveTradingEngineV2:
                     f"🎯 TARGET HIT: {position.symbol} "
                     f"LTP=₹{ltp:.2f} >= Target=₹{position.target_price:.2f}"
                 )
-                await self._exit_position(position, "target")
+                await self._exit_position(position, "target", ltp)
 
             # Check stoploss hit
             elif position.stoploss_price and ltp <= position.stoploss_price:
@@ -412,7 +500,7 @@ class LiveTradingEngineV2:
                     f"🛑 STOPLOSS HIT: {position.symbol} "
                     f"LTP=₹{ltp:.2f} <= SL=₹{position.stoploss_price:.2f}"
                 )
-                await self._exit_position(position, "stoploss")
+                await self._exit_position(position, "stoploss", ltp)
 
         except Exception as e:
             logger.error(f"❌ Error checking position targets for {position.symbol}: {e}")
@@ -424,42 +512,57 @@ class LiveTradingEngineV2:
         squared_count = 0
         failed_count = 0
 
-        for key, position in list(self.active_positions.items()):
+        # Snapshot, since _exit_position pops from active_positions;
+        # fetch exit LTPs for all positions in one broker call
+        positions = tuple(self.active_positions.values())
+        ltp_map = self._fetch_position_ltps(positions) if positions else {}
+
+        for position in positions:
             try:
-                await self._exit_position(position, "square_off")
-                squared_count += 1
+                # A missing quote falls back to _exit_position's own fetch
+                if await self._exit_position(
+                    position, "square_off", ltp_map.get(position.ltp_key)
+                ):
+                    squared_count += 1
+                else:
+                    failed_count += 1
             except Exception as e:
-                logger.error(f"❌ Error squaring off position {key}: {e}")
+                logger.error(f"❌ Error squaring off position {position.position_key}: {e}")
                 failed_count += 1
 
         logger.info(f"✅ Square-off complete: {squared_count} closed, {failed_count} failed")
 
-    async def _exit_position(self, position: Position, exit_reason: str):
+    async def _exit_position(self, position: Position, exit_reason: str,
+                             ltp: Optional[float] = None) -> bool:
         """
         Exit a position by placing a SELL order.
 
         Args:
             position: Position to exit
             exit_reason: Reason for exit ('target', 'stoploss', 'square_off')
+            ltp: Exit LTP if already known (fetched from the broker otherwise)
+
+        Returns:
+            True if the position was closed
         """
         try:
             logger.info(f"📤 Exiting position {position.symbol}: {exit_reason}")
 
-            # Get current LTP
-            ltp_data = self.middleware.get_ltp([f"NFO:{position.symbol}"])
-            ltp = ltp_data.get(f"NFO:{position.symbol}", 0) if ltp_data else 0
+            # Get current LTP unless the caller already has it
+            if ltp is None:
+                ltp = self._fetch_position_ltps([position]).get(position.ltp_key, 0)
 
             if not ltp or ltp <= 0:
                 logger.error(f"❌ Cannot get LTP for exit: {position.symbol}")
-                return
+                return False
 
             # Close position
             position.close(ltp, exit_reason)
 
             # Remove from active positions
-            key = f"{position.symbol.split('CE')[0].split('PE')[0]}_{position.symbol}"
-            if key in self.active_positions:
-                del self.active_positions[key]
+            self.active_positions.pop(position.position_key, None)
+            self._token_to_position.pop(position.instrument_token, None)
+            self._rebuild_position_arrays()
 
             # Update funds
             pnl = position.pnl
@@ -470,9 +573,11 @@ class LiveTradingEngineV2:
                 f"✅ Position closed - P&L: ₹{pnl:,.2f} "
                 f"({(pnl/(position.entry_price * position.quantity)*100):.2f}%)"
             )
+            return True
 
         except Exception as e:
             logger.error(f"❌ Error exiting position {position.symbol}: {e}")
+            return False
 
     async def _handle_ltp_update(self, instrument_token: str, ltp: float, tick_data: Dict, source: str):
         """
@@ -496,12 +601,12 @@ class LiveTradingEngineV2:
                 return
 
             # Handle NIFTY 50 updates (for signal generation)
-            if instrument_token == "256265":  # NIFTY 50
+            if instrument_token == NIFTY_TOKEN:
                 await self._process_nifty_ltp_update(ltp)
 
-            # Handle position LTP updates (for target/stoploss monitoring)
-            elif instrument_token in self.subscribed_instruments:
-                await self._process_position_ltp_update(instrument_token, ltp)
+            # Handle position LTP updates (target/stoploss checked on every tick)
+            elif (position := self._token_to_position.get(instrument_token)) is not None:
+                await self._check_position_targets(position, ltp)
 
         except Exception as e:
             logger.error(f"❌ Error handling LTP update for {instrument_token}: {e}")
@@ -518,36 +623,133 @@ class LiveTradingEngineV2:
             previous_ltp = self.nifty_ltp
             self.nifty_ltp = ltp
 
-            # Skip if no previous data or LTP unchanged
-            if not previous_ltp or previous_ltp == ltp:
+            # Skip if no previous data or LTP hasn't moved by a tick
+            # (half a tick, so float noise on a one-tick move doesn't count as no move)
+            if not previous_ltp or abs(ltp - previous_ltp) < self.config.tick_size / 2:
                 return
 
-            # Update price buffer for rolling indicators
-            self.price_buffer.append(ltp)
-
-            # Recalculate indicators from rolling price buffer
-            self.current_indicators = self.trading_logic.calculate_indicators_from_array(
-                np.array(list(self.price_buffer))
-            )
+            # Update price buffer and rolling indicators in O(1)
+            self.current_indicators = self._update_indicators(ltp)
 
-            # Update trends
-            self.major_trend = self.current_indicators.get('trend', 'neutral')
-            self.minor_trend = self.major_trend  # Simplified for now
+            # Update trends (only when the trend actually changes)
+            trend = self.current_indicators['trend']
+            if trend != self.major_trend:
+                self.major_trend = self.minor_trend = trend  # Minor mirrors major for now
+                self._trends = (trend, trend)
 
             # Detect LTP-based crossovers (REAL-TIME)
-            crossovers = self.trading_logic.detect_ltp_crossovers(
-                current_ltp=ltp,
-                previous_ltp=previous_ltp,
-                indicators=self.current_indicators
-            )
+            indicators = self.current_indicators
+            if indicators['ma20'] is None:
+                return
+            levels = (indicators['ma7'], indicators['ma20'], indicators['lbb'], indicators['ubb'])
+            flags = _detect_crossovers_kernel(ltp, previous_ltp, *levels)
+            if not flags.any():
+                return
 
             # Process each detected crossover immediately
-            for crossover in crossovers:
-                await self._process_crossover_signal(crossover, ltp)
+            now = datetime.now()
+            for trigger, flag, level in zip(self.CROSSOVER_TRIGGERS, flags, levels):
+                if flag:
+                    crossover = {
+                        'trigger': trigger,
+                        'direction': 'below' if flag < 0 else 'above',
+                        'indicator_value': float(level),
+                        'crossed_at_ltp': ltp,
+                        'timestamp': now
+                    }
+                    await self._process_crossover_signal(crossover, ltp)
 
         except Exception as e:
             logger.error(f"❌ Error processing NIFTY LTP update: {e}")
 
+    def _push_price(self, ltp: float):
+        """Append an LTP to the rolling price buffer, evicting the oldest when full."""
+        head = self._price_head
+        self._price_buf[head] = ltp
+        self._price_buf[head + self.PRICE_BUFFER_SIZE] = ltp
+        self._price_head = (head + 1) % self.PRICE_BUFFER_SIZE
+        if self._price_count < self.PRICE_BUFFER_SIZE:
+            self._price_count += 1
+
+    def _price_view(self) -> np.ndarray:
+        """Oldest-to-newest buffered prices as a view (valid until the next push)."""
+        start = (self._price_head - self._price_count) % self.PRICE_BUFFER_SIZE
+        return self._price_buf[start:start + self._price_count]
+
+    def _update_indicators(self, ltp: float) -> Dict:
+        """
+        Push an LTP and update indicators from running window sums.
+
+        Each window sum adds the new price and subtracts the one leaving the
+        window, so a tick costs O(1) instead of recomputing every window over
+        the whole buffer. Same keys and values as
+        TradingLogicService.calculate_indicators_from_array.
+
+        Args:
+            ltp: Current NIFTY LTP
+
+        Returns:
+            Dict with keys: close, ma7, ma20, lbb, ubb, trend
+        """
+        logic = self.trading_logic
+        window = self._price_view()
+        count = len(window)
+        shift = self._sum_shift
+
+        # Evict the prices leaving each window, then add the new one
+        if count >= logic.ma_short_period:
+            self._sum_short -= window[-logic.ma_short_period] - shift
+        if count >= logic.ma_long_period:
+            self._sum_long -= window[-logic.ma_long_period] - shift
+        if count >= logic.bb_period:
+            old = window[-logic.bb_period] - shift
+            self._sum_bb -= old
+            self._sumsq_bb -= old * old
+        x = ltp - shift
+        self._sum_short += x
+        self._sum_long += x
+        self._sum_bb += x
+        self._sumsq_bb += x * x
+
+        self._push_price(ltp)
+        if self._price_head == 0 or self._price_count == 1:
+            # Once per buffer lap, recompute exactly so rounding drift can't build up
+            self._reseed_running_sums()
+
+        if self._price_count < max(logic.ma_short_period, logic.ma_long_period, logic.bb_period):
+            return {
+                'close': None, 'ma7': None, 'ma20': None,
+                'lbb': None, 'ubb': None, 'trend': 'neutral'
+            }
+
+        shift = self._sum_shift
+        ma7 = self._sum_short / logic.ma_short_period + shift
+        ma20 = self._sum_long / logic.ma_long_period + shift
+        bb_mean = self._sum_bb / logic.bb_period
+        std = np.sqrt(max(self._sumsq_bb / logic.bb_period - bb_mean * bb_mean, 0.0))
+        bb_mean += shift
+
+        return {
+            'close': ltp,
+            'ma7': ma7,
+            'ma20': ma20,
+            'lbb': bb_mean - logic.bb_std * std,
+            'ubb': bb_mean + logic.bb_std * std,
+            'trend': logic.determine_trend_from_values(ma7, ma20)
+        }
+
+    def _reseed_running_sums(self):
+        """Recompute the running window sums exactly, re-centred on the latest price."""
+        logic = self.trading_logic
+        window = self._price_view()
+        self._sum_shift = float(window[-1])
+        centred = window - self._sum_shift
+        self._sum_short = float(centred[-logic.ma_short_period:].sum())
+        self._sum_long = float(centred[-logic.ma_long_period:].sum())
+        bb_window = centred[-logic.bb_period:]
+        self._sum_bb = float(bb_window.sum())
+        self._sumsq_bb = float(np.dot(bb_window, bb_window))
+
     async def _process_crossover_signal(self, crossover: Dict, nifty_ltp: float):
         """
         Process a detected crossover signal immediately.
@@ -598,8 +800,7 @@ class LiveTradingEngineV2:
         """
         try:
             # Get current trends
-            major_trend = self.major_trend or 'neutral'
-            minor_trend = self.minor_trend or 'neutral'
+            major_trend, minor_trend = self._trends
 
             # Test both CE and PE to see which one should trade
             for option_type in ['CE', 'PE']:
@@ -729,7 +930,11 @@ class LiveTradingEngineV2:
                 self.allocated_funds += capital_required
 
                 # Add to active positions
+                position.position_key = position_key
+                position.instrument_token = str(contract['instrument_token'])
                 self.active_positions[position_key] = position
+                self._token_to_position[position.instrument_token] = position
+                self._rebuild_position_arrays()
 
                 # Cache SELL order details for bracket execution
                 sell_details = {
@@ -777,16 +982,15 @@ class LiveTradingEngineV2:
     async def _find_contract(self, nifty_ltp: float, option_type: str, expiry_date: str) -> Optional[Dict]:
         """Find appropriate option contract."""
         try:
-            # Calculate strike price
-            strike_gap = self.config.min_strike_gap
-            round_to = self.config.strike_round_to
+            # Calculate strike price (integer arithmetic: strikes are multiples of round_to)
+            strike_gap = int(self.config.min_strike_gap)
+            round_to = int(self.config.strike_round_to)
+            floor_strike = (int(nifty_ltp) // round_to) * round_to
 
             if option_type == 'CE':
-                base_strike = ((nifty_ltp // round_to) * round_to) + round_to
-                strike = base_strike + strike_gap
+                strike = floor_strike + round_to + strike_gap
             else:  # PE
-                base_strike = ((nifty_ltp // round_to) * round_to)
-                strike = base_strike - strike_gap
+                strike = floor_strike - strike_gap
 
             # Create contract symbol (simplified)
             symbol = f"NIFTY25NOV{strike}{option_type}"
@@ -794,7 +998,7 @@ class LiveTradingEngineV2:
             return {
                 'instrument_token': f"token_{symbol}",
                 'tradingsymbol': symbol,
-                'strike': int(strike),
+                'strike': strike,
                 'expiry': expiry_date,
                 'exchange': 'NFO',
                 'lot_size': self.config.lot_size
@@ -864,18 +1068,6 @@ class LiveTradingEngineV2:
         """Get cached SELL order details."""
         return self.pending_sell_orders.get(buy_order_id)
 
-    async def _process_position_ltp_update(self, instrument_token: str, ltp: float):
-        """Process LTP update for position monitoring."""
-        try:
-            # Find position by instrument token
-            for position in self.active_positions.values():
-                if position.instrument_token == instrument_token:
-                    await self._check_position_targets(position)
-                    break
-
-        except Exception as e:
-            logger.error(f"❌ Error processing position LTP update: {e}")
-
     async def _auto_subscribe_instruments(self):
         """Auto-subscribe to instruments for webhook."""
         try:
@@ -884,7 +1076,7 @@ class LiveTradingEngineV2:
             instruments_to_subscribe = set()
 
             # Subscribe to NIFTY 50
-            nifty_token = "256265"
+            nifty_token = NIFTY_TOKEN
             instruments_to_subscribe.add(nifty_token)
 
             # Subscribe to active positions
@@ -923,7 +1115,10 @@ class LiveTradingEngineV2:
             self.subscribed_instruments.add(instrument_token)
 
         except Exception as e:
-            logger.error(f"❌ Error subscribing to new instrument {instrument_name}: {e}")
+            logger.error(
+                f"❌ Error subscribing to new instrument {instrument_name}: {e} - "
+                f"targets/SL will only be checked by the {self.POSITION_RECONCILE_INTERVAL}s reconciliation poll"
+            )
 
     def _get_buy_percentage_below(self, trigger: str) -> float:
         """Get the percentage to reduce BUY price below LTP."""
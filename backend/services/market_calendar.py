@@ -5,16 +5,25 @@ Only checks: is trading day, market hours, next trading session.
 """
 import pandas as pd
 import exchange_calendars as xcals
-from datetime import datetime, time, timedelta
+from datetime import datetime, date, time, timedelta
 from typing import Dict, Optional
 from functools import lru_cache
 import pytz
 import logging
+import sys
 
 logger = logging.getLogger(__name__)
 
 IST = pytz.timezone('Asia/Kolkata')
 
+# Bit i set => weekday i (Monday=0) is a trading day; Mon-Fri by default
+TRADING_DAYS_MASK = 0b0011111
+
+# Interned once so status responses reuse the same string objects
+WEEKDAY_NAMES = tuple(sys.intern(d) for d in (
+    'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'
+))
+
 _calendar_cache = None
 
 
@@ -49,14 +58,14 @@ class MarketCalendar:
     # ==================== Trading Day Check ====================
     
     @lru_cache(maxsize=365)
-    def is_trading_day(self, date_str: str) -> bool:
-        """Check if date is a trading day (cached)"""
-        date_only = pd.Timestamp(date_str)
+    def is_trading_day(self, day: date) -> bool:
+        """Check if date is a trading day (cached by date)"""
+        date_only = pd.Timestamp(day)
         
         # Check calendar range
         if date_only < self.calendar.sessions.min() or date_only > self.calendar.sessions.max():
             # Outside calendar: weekday = trading day
-            return date_only.weekday() < 5
+            return is_trading_weekday(date_only.weekday())
         
         return self.calendar.is_session(date_only)
     
@@ -66,8 +75,7 @@ class MarketCalendar:
             check_date = self.get_current_time()
         
         check_date = self.convert_to_ist(check_date)
-        date_str = check_date.strftime('%Y-%m-%d')
-        return self.is_trading_day(date_str)
+        return self.is_trading_day(check_date.date())
     
     # ==================== Market Status ====================
     
@@ -100,7 +108,7 @@ class MarketCalendar:
         date = self.convert_to_ist(date)
         date_only = pd.Timestamp(date.date())
         
-        if not self.is_trading_day(date_only.strftime('%Y-%m-%d')):
+        if not self.is_trading_day(date.date()):
             return {'open': None, 'close': None}
         
         # Check calendar range
@@ -124,17 +132,16 @@ class MarketCalendar:
         is_trading = self.is_trading_day_dt(now)
         hours = self.get_market_open_close(now)
         
-        day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        
         status = {
             'is_open': is_open,
             'is_trading_day': is_trading,
             'current_time': now.strftime('%Y-%m-%d %H:%M:%S %Z'),
-            'current_day': day_names[now.weekday()],
+            'current_day': WEEKDAY_NAMES[now.weekday()],
             'market_open_time': hours['open'].strftime('%H:%M') if hours['open'] else None,
             'market_close_time': hours['close'].strftime('%H:%M') if hours['close'] else None,
             'exchange': self.calendar.name,
-            'next_trading_day': None
+            'next_trading_day': None,
+            'trading_days_mask': TRADING_DAYS_MASK
         }
         
         # Find next trading day
@@ -187,6 +194,11 @@ def get_market_calendar() -> MarketCalendar:
 
 # ==================== Convenience Functions ====================
 
+def is_trading_weekday(weekday: int, mask: int = TRADING_DAYS_MASK) -> bool:
+    """Check if a weekday (Monday=0) is set in the trading days mask"""
+    return bool(mask & (1 << weekday))
+
+
 def is_market_open(check_time: Optional[datetime] = None) -> bool:
     """Check if market is currently open"""
     calendar = get_market_calendar()
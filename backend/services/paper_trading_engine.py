@@ -15,6 +15,7 @@ Uses unified BrokerDataService for consistent data access.
 import logging
 from datetime import datetime, time, timedelta
 from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 import pytz
 from sqlalchemy.orm import Session
@@ -1075,7 +1076,7 @@ class PaperTradingEngine:
             from_date = self.current_timestamp.replace(hour=9, minute=15, second=0, microsecond=0)
             to_date = self.current_timestamp.replace(hour=15, minute=30, second=0, microsecond=0)
             
-            historical_data = self.broker_data.get_historical_data(
+            candles = self.broker_data.get_historical_data_array(
                 instrument_token=instrument_token,
                 from_date=from_date,
                 to_date=to_date,
@@ -1083,9 +1084,9 @@ class PaperTradingEngine:
                 use_cache=True  # Cache is day-specific, so OK to cache
             )
             
-            if historical_data:
+            if len(candles):
                 # Find the candle closest to (but not after) current timestamp
-                # Ensure both timestamps are timezone-aware for comparison
+                # Candle 'ts' is epoch seconds, so compare against an aware timestamp
                 import pytz
                 IST = pytz.timezone('Asia/Kolkata')
                 
@@ -1094,28 +1095,16 @@ class PaperTradingEngine:
                 if current_ts.tzinfo is None:
                     current_ts = IST.localize(current_ts)
                 
-                valid_candles = []
-                for c in historical_data:
-                    candle_dt = pd.to_datetime(c['date'])
-                    # Make candle datetime timezone-aware
-                    if candle_dt.tz is None:
-                        candle_dt = IST.localize(candle_dt)
-                    
-                    if candle_dt <= current_ts:
-                        valid_candles.append(c)
-                
-                if not valid_candles:
+                valid = np.flatnonzero(candles['ts'] <= current_ts.timestamp())
+                if not len(valid):
                     logger.debug(f"No historical data available before {current_ts} for {contract.tradingsymbol}")
                     return None
                 
                 # Get the most recent candle before current timestamp
-                closest_candle = max(valid_candles, 
-                                   key=lambda x: IST.localize(pd.to_datetime(x['date'])) if pd.to_datetime(x['date']).tz is None else pd.to_datetime(x['date']))
-                ltp = closest_candle.get('close', 0.0)
+                closest = valid[np.argmax(candles['ts'][valid])]
+                ltp = float(candles['close'][closest])
                 
-                candle_time = pd.to_datetime(closest_candle['date'])
-                if candle_time.tz is None:
-                    candle_time = IST.localize(candle_time)
+                candle_time = datetime.fromtimestamp(int(candles['ts'][closest]), IST)
                 logger.debug(f"Historical LTP for {contract.tradingsymbol}: ₹{ltp:.2f} at {candle_time} (simulation time: {current_ts})")
                 return ltp
             else:
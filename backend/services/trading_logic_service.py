@@ -22,42 +22,11 @@ from typing import Dict, List, Optional, Tuple, Union
 from collections import deque
 import pandas as pd
 import numpy as np
-from numba import jit
 from datetime import datetime
 
-logger = logging.getLogger(__name__)
-
-
-# ===== OPTIMIZED NUMBA FUNCTIONS =====
-
-@jit(nopython=True)
-def calculate_sma_numba(data: np.ndarray, period: int) -> np.ndarray:
-    """Calculate Simple Moving Average using numba for performance"""
-    result = np.empty_like(data)
-    result[:period-1] = np.nan
-    
-    for i in range(period-1, len(data)):
-        result[i] = np.mean(data[i-period+1:i+1])
-    
-    return result
-
+from backend.core.calculations import compute_indicators
 
-@jit(nopython=True)
-def calculate_bollinger_bands_numba(data: np.ndarray, period: int, std_dev: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-    """Calculate Bollinger Bands using numba for performance"""
-    sma = calculate_sma_numba(data, period)
-    upper = np.empty_like(data)
-    lower = np.empty_like(data)
-    
-    upper[:period-1] = np.nan
-    lower[:period-1] = np.nan
-    
-    for i in range(period-1, len(data)):
-        std = np.std(data[i-period+1:i+1])
-        upper[i] = sma[i] + (std_dev * std)
-        lower[i] = sma[i] - (std_dev * std)
-    
-    return sma, upper, lower
+logger = logging.getLogger(__name__)
 
 
 class TradingLogicService:
@@ -168,31 +137,25 @@ class TradingLogicService:
         Returns:
             Dict with keys: ma7, ma20, lbb, ubb, trend, close
         """
-        if len(close_prices) < self.ma_long_period:
+        if len(close_prices) < max(self.ma_short_period, self.ma_long_period, self.bb_period):
             return {
                 'close': None, 'ma7': None, 'ma20': None,
                 'lbb': None, 'ubb': None, 'trend': 'neutral'
             }
         
-        # Calculate using optimized numba functions
-        ma7 = calculate_sma_numba(close_prices, self.ma_short_period)
-        ma20 = calculate_sma_numba(close_prices, self.ma_long_period)
-        bb_sma, ubb, lbb = calculate_bollinger_bands_numba(close_prices, self.bb_period, self.bb_std)
-        
-        # Get latest values
-        latest_idx = -1
-        latest_close = close_prices[latest_idx]
+        # Latest-bar MAs and bands from one fused numba pass
+        ma7, ma20, _, lbb, ubb = compute_indicators(
+            np.asarray(close_prices, dtype=np.float64),
+            self.ma_short_period, self.ma_long_period, self.bb_period, self.bb_std
+        )
         
         indicators = {
-            'close': latest_close,
-            'ma7': ma7[latest_idx] if not np.isnan(ma7[latest_idx]) else None,
-            'ma20': ma20[latest_idx] if not np.isnan(ma20[latest_idx]) else None,
-            'lbb': lbb[latest_idx] if not np.isnan(lbb[latest_idx]) else None,
-            'ubb': ubb[latest_idx] if not np.isnan(ubb[latest_idx]) else None,
-            'trend': self.determine_trend_from_values(
-                ma7[latest_idx] if not np.isnan(ma7[latest_idx]) else None,
-                ma20[latest_idx] if not np.isnan(ma20[latest_idx]) else None
-            )
+            'close': close_prices[-1],
+            'ma7': ma7,
+            'ma20': ma20,
+            'lbb': lbb,
+            'ubb': ubb,
+            'trend': self.determine_trend_from_values(ma7, ma20)
         }
         
         return indicators
@@ -12,6 +12,9 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 
+# Pretty-printed; numpy scalars/arrays and int keys serialize natively
+DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
 
 class ConfigManager:
     """
@@ -46,8 +49,7 @@ class ConfigManager:
         try:
             if config_file.exists():
                 # Use orjson for 10x faster loading
-                with open(config_file, 'rb') as f:
-                    return orjson.loads(f.read())
+                return orjson.loads(config_file.read_bytes())
             else:
                 # Create default config
                 default_config = self._get_default_trading_config()
@@ -69,12 +71,11 @@ class ConfigManager:
 
         try:
             if instruments_file.exists():
-                with open(instruments_file, 'rb') as f:
-                    data = orjson.loads(f.read())
-                    instruments = data.get('instruments', [])
+                data = orjson.loads(instruments_file.read_bytes())
+                instruments = data.get('instruments', [])
 
-                    # Create token -> instrument mapping for O(1) lookups
-                    return {inst['instrument_token']: inst for inst in instruments}
+                # Create token -> instrument mapping for O(1) lookups
+                return {inst['instrument_token']: inst for inst in instruments}
             else:
                 # Return empty dict - will be populated by broker API
                 return {}
@@ -97,8 +98,7 @@ class ConfigManager:
             config_file = self.config_dir / "trading_config.json"
 
             # Use orjson with pretty printing
-            with open(config_file, 'wb') as f:
-                f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+            config_file.write_bytes(orjson.dumps(config, option=DUMP_OPTIONS))
 
             return True
 
@@ -126,8 +126,7 @@ class ConfigManager:
                 'download_type': 'api'
             }
 
-            with open(instruments_file, 'wb') as f:
-                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            instruments_file.write_bytes(orjson.dumps(data, option=DUMP_OPTIONS))
 
             return True
 
@@ -135,6 +134,26 @@ class ConfigManager:
             print(f"Error saving instruments: {e}")
             return False
 
+    def load_broker_config(self) -> Optional[Dict[str, Any]]:
+        """
+        Load broker configuration from JSON file, if present.
+
+        DEPRECATED: Broker configuration should be stored in .env file, not JSON.
+
+        Returns:
+            Dict containing broker configuration, or None if not saved
+        """
+        broker_file = self.config_dir / "broker_config.json"
+
+        try:
+            if broker_file.exists():
+                return orjson.loads(broker_file.read_bytes())
+            return None
+
+        except Exception as e:
+            print(f"Error loading broker config: {e}")
+            return None
+
     def save_broker_config(self, config: Dict[str, Any]) -> bool:
         """
         Save broker configuration to JSON file.
@@ -151,8 +170,7 @@ class ConfigManager:
         try:
             broker_file = self.config_dir / "broker_config.json"
 
-            with open(broker_file, 'wb') as f:
-                f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+            broker_file.write_bytes(orjson.dumps(config, option=DUMP_OPTIONS))
 
             return True
 
@@ -236,6 +236,14 @@ class Position:
     Replaces database-stored positions with pure Python objects.
     """
 
+    # Fixed attribute set: faster attribute access on the tick path, no per-instance dict
+    __slots__ = (
+        'symbol', 'ltp_key', 'quantity', 'entry_price', 'target_price',
+        'stoploss_price', 'current_price', 'status', 'entry_time', 'exit_time',
+        'exit_price', 'pnl', 'instrument_token', 'position_key',
+        'order_id_buy', 'order_id_sell'
+    )
+
     def __init__(self,
                  symbol: str,
                  quantity: int,
@@ -253,6 +261,7 @@ class Position:
             stoploss_price: Stoploss price
         """
         self.symbol = symbol
+        self.ltp_key = f"NFO:{symbol}"  # LTP lookup key, built once
         self.quantity = quantity
         self.entry_price = entry_price
         self.target_price = target_price
@@ -264,6 +273,7 @@ class Position:
         self.exit_price = None
         self.pnl = 0.0
         self.instrument_token = None
+        self.position_key = None  # Key in the engine's active_positions
         self.order_id_buy = None
         self.order_id_sell = None
 